@@ -14,13 +14,19 @@ def spy_enabled() -> bool:
 
 
 def spy_trace(func):
+    """Log entry/exit of ``func`` when INFERNO_SPY is set.
+
+    The flag is read when the function is decorated: with spy off (the default) the original
+    function is returned unwrapped, so hot helpers pay no extra call frame or env lookups.
+    """
+    if not spy_enabled():
+        return func
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        if spy_enabled():
-            _SPY_LOGGER.info("Entering %s", func.__qualname__)
+        _SPY_LOGGER.info("Entering %s", func.__qualname__)
         result = func(*args, **kwargs)
-        if spy_enabled():
-            _SPY_LOGGER.info("Exiting %s", func.__qualname__)
+        _SPY_LOGGER.info("Exiting %s", func.__qualname__)
         return result
 
     return wrapper
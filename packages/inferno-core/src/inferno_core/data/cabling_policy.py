@@ -1,5 +1,6 @@
 # inferno_core/data/cabling_policy.py
 from __future__ import annotations
+from functools import lru_cache
 from pathlib import Path
 
 from inferno_core.codebase.deprecation import deprecated
@@ -7,11 +8,31 @@ from inferno_core.data.loader import load_yaml_typed
 from inferno_core.models.cabling_policy import CablingPolicy
 
 
-def load_cabling_policy_typed(path: str | Path) -> CablingPolicy:
-    """Preferred: strongly-typed policy loader (Pydantic v2)."""
+@lru_cache(maxsize=32)
+def _load_cabling_policy_cached(path: str, mtime_ns: int, size: int) -> CablingPolicy:
+    # mtime_ns/size are part of the cache key only: an edited policy file misses the cache.
     return load_yaml_typed(Path(path), model=CablingPolicy)
 
 
+def clear_policy_cache() -> None:
+    """Forget all memoized policies (e.g. between tests)."""
+    _load_cabling_policy_cached.cache_clear()
+
+
+def load_cabling_policy_typed(path: str | Path) -> CablingPolicy:
+    """Preferred: strongly-typed policy loader (Pydantic v2).
+
+    Memoized per file and modification time; the returned model is shared, so treat it as read-only.
+    """
+    p = Path(path)
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        # Let the loader raise its usual "File not found" error.
+        return load_yaml_typed(p, model=CablingPolicy)
+    return _load_cabling_policy_cached(str(p.resolve()), st.st_mtime_ns, st.st_size)
+
+
 # Keep the old CLI-visible name as a thin wrapper, but steer callers over.
 @deprecated(
     message="inferno_tools.cabling.cabling.load_cabling_policy is deprecated.",
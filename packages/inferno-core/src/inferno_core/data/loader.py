@@ -1,3 +1,4 @@
+import copy
 import warnings
 from pathlib import Path
 from typing import Any, Generic, TypeVar, overload
@@ -9,6 +10,13 @@ from pydantic import BaseModel as GenericModel
 T = TypeVar("T")
 U = TypeVar("U", bound=BaseModel)
 
+# Prefer the libyaml C bindings; PyYAML builds without them fall back to the pure-Python classes.
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
 
 class MapOf(GenericModel, Generic[U]):
     root: dict[str, U]
@@ -19,27 +27,57 @@ class MapOf(GenericModel, Generic[U]):
 # -------------------------------
 
 
+# Parsed documents keyed by resolved path; an entry is reused only while the file's
+# (mtime_ns, size) stamp is unchanged, so edits on disk are picked up on the next read.
+_YAML_CACHE: dict[str, tuple[int, int, Any]] = {}
+
+
+def clear_yaml_cache() -> None:
+    """Drop all parsed YAML documents memoized by the raw reader."""
+    _YAML_CACHE.clear()
+
+
 def _read_yaml_raw(path: Path | str) -> Any:
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"File not found: {p}")
+    """Read and parse a YAML file, memoized by path + mtime.
 
+    The returned object is shared between callers; treat it as read-only.
+    """
+    p = Path(path)
     try:
-        text = p.read_text(encoding="utf-8")
-    except UnicodeDecodeError as e:
-        raise ValueError(f"Unable to decode UTF-8 in {p}: {e}") from e
+        st = p.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {p}") from None
+
+    key = str(p.resolve())
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
 
+    # Hand the loader raw bytes: it decodes UTF-8 itself, so there is no separate str copy of the file.
     try:
-        data = yaml.safe_load(text)
+        data = yaml.load(p.read_bytes(), Loader=SafeLoader)
+    except yaml.reader.ReaderError as e:
+        raise ValueError(f"Unable to decode UTF-8 in {p}: {e}") from e
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML in {p}: {e}") from e
 
     if data is None:
         raise ValueError(f"Empty YAML file: {p}")
 
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
     return data
 
 
+def dump_yaml_bytes(data: Any, *, sort_keys: bool = True) -> bytes:
+    """Serialize ``data`` as block-style UTF-8 YAML with the preferred safe dumper.
+
+    The whole document is emitted in memory so callers can write it out in one call.
+    """
+    return yaml.dump(
+        data, Dumper=SafeDumper, default_flow_style=False, sort_keys=sort_keys, allow_unicode=True, encoding="utf-8"
+    )
+
+
 # -------------------------------
 # Public typed YAML loader (preferred)
 # -------------------------------
@@ -134,4 +172,5 @@ def _deprecated(reason: str):
 @_deprecated("Use load_yaml_typed()/load_yaml_list()/load_yaml_dict_values instead.")
 def load_yaml_file(path: Path | str):
     """Legacy, untyped YAML loader. Prefer typed loaders above."""
-    return _read_yaml_raw(path)
+    # Legacy callers may mutate the result; keep the cached document pristine.
+    return copy.deepcopy(_read_yaml_raw(path))
@@ -8,7 +8,7 @@ used by inferno-cli tools cabling calculate|validate|visualize.
 from pathlib import Path
 from typing import Any
 
-import yaml
+from inferno_core.data.loader import _read_yaml_raw
 from inferno_core.models.records import NodeRec, SiteRec, SpineRec, TopologyRec, TorRec
 from pydantic import TypeAdapter, ValidationError
 
@@ -20,21 +20,7 @@ def _read_yaml(path: Path | str) -> dict | list:
     - Normalizes YAML errors to ValueError with file context
     """
     p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"File not found: {p}")
-
-    try:
-        text = p.read_text(encoding="utf-8")
-    except UnicodeDecodeError as e:
-        raise ValueError(f"Unable to decode UTF-8 in {p}: {e}") from e
-
-    try:
-        data: Any = yaml.safe_load(text)
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in {p}: {e}") from e
-
-    if data is None:
-        raise ValueError(f"Empty YAML file: {p}")
+    data: Any = _read_yaml_raw(p)
 
     if not isinstance(data, dict | list):
         raise ValueError(f"Unsupported top-level YAML type {type(data).__name__} in {p}; expected dict or list")
@@ -160,11 +146,12 @@ def load_site(path: Path | str = Path("doctrine/site.yaml")) -> SiteRec | None:
         ValueError: If file is malformed
     """
     path = Path(path)
-    if not path.exists():
+    try:
+        data = _read_yaml(path)
+    except FileNotFoundError:
         return None
 
     try:
-        data = _read_yaml(path)
         return SiteRec.model_validate(data)
 
     except ValidationError as e:
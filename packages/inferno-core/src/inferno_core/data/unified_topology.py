@@ -8,7 +8,7 @@ capacity-level information for cabling calculations.
 from pathlib import Path
 from typing import List
 
-import yaml
+from inferno_core.data.loader import _read_yaml_raw
 from inferno_core.models.unified_topology import (
     UnifiedInterface,
     UnifiedPorts,
@@ -22,18 +22,8 @@ from pydantic import ValidationError
 
 def _read_yaml(path: Path | str) -> dict | list:
     """Read and parse YAML file."""
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"File not found: {path}")
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        if data is None:
-            raise ValueError(f"Empty or invalid YAML file: {path}")
-        return data
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML in {path}: {e}")
+    # Existence, decoding and parse errors are handled (and the result cached) by the shared reader.
+    return _read_yaml_raw(path)
 
 
 def _derive_capacity_info(
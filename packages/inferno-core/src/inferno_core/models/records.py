@@ -138,11 +138,20 @@ class SiteRackRec(BaseModel):
         return None if v is None else int(v)
 
 
+class WanHandoffRec(BaseModel):
+    """WAN handoff from the spine to the upstream router."""
+
+    model_config = ConfigDict(extra="ignore")
+    count: int = Field(default=2, ge=0)
+    type: str = "RJ45"
+
+
 class SiteRec(BaseModel):
     """Site configuration with rack layout."""
 
     model_config = ConfigDict(extra="ignore")
     racks: list[SiteRackRec]
+    wan_handoff: WanHandoffRec | None = None
 
 
 class LinkRec(BaseModel):
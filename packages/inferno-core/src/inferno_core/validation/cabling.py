@@ -5,7 +5,9 @@ Provides deterministic validation of manifests, topology, and cabling policy
 against Inferno's network design rules before calculation/installation.
 """
 
-import yaml
+import copy
+
+from inferno_core.data.loader import _read_yaml_raw
 from inferno_core.data.network_loader import (
     load_nodes,
     load_site,
@@ -18,8 +20,9 @@ from inferno_core.models.records import NodeRec, SiteRec, TopologyRec, TorRec
 # Import shared geometry helpers
 from inferno_tools.cabling.common import (
     apply_slack,
-    compute_rack_distance_m,
+    compute_rack_distances_m,
     select_length_bin,
+    select_length_bins_many,
 )
 
 
@@ -56,14 +59,14 @@ def _load_policy(policy_path: str | None = None) -> dict:
 
     if policy_path:
         try:
-            with open(policy_path, "r") as f:
-                policy = yaml.safe_load(f)
-                # Merge with defaults
-                for key, value in policy.items():
-                    if isinstance(value, dict) and key in defaults:
-                        defaults[key].update(value)
-                    else:
-                        defaults[key] = value
+            # The parse is memoized by path + mtime and shared, so merge from a private copy
+            policy = copy.deepcopy(_read_yaml_raw(policy_path))
+            # Merge with defaults
+            for key, value in policy.items():
+                if isinstance(value, dict) and key in defaults:
+                    defaults[key].update(value)
+                else:
+                    defaults[key] = value
         except FileNotFoundError:
             pass  # Use defaults
 
@@ -201,6 +204,11 @@ def validate_compatibility(
     """Validate NIC type compatibility."""
     findings = []
 
+    # Index racks once instead of scanning topology.racks for every NIC (first entry wins, as the scan did)
+    racks_by_id = {}
+    for r in topology.racks:
+        racks_by_id.setdefault(r.rack_id, r)
+
     for node in nodes:
         if not node.nics:
             continue
@@ -208,7 +216,7 @@ def validate_compatibility(
         for nic in node.nics:
             if nic.type == "SFP28":
                 # Must terminate on SFP28-capable port (ToR leaf)
-                rack = next((r for r in topology.racks if r.rack_id == node.rack_id), None)
+                rack = racks_by_id.get(node.rack_id)
                 if not rack:
                     findings.append(
                         Finding(
@@ -514,25 +522,21 @@ def validate_lengths(
     # Check leaf→spine lengths
     spine_position = (0, 0)  # Assume spine at origin for simplicity
     tile_m = heuristics.get("tile_m", 1.0)
-
-    for rack in topology.racks:
-        rack_pos = rack_positions.get(rack.rack_id)
-        if not rack_pos:
-            continue
-
-        # Use shared geometry helper for Manhattan distance calculation
-        base_distance = compute_rack_distance_m(tuple(rack_pos), spine_position, tile_m)
-
-        # Apply slack factor using shared helper
+    # Distances from the spine to every placed rack, computed in one pass with the shared helper
+    spine_distances = compute_rack_distances_m(spine_position, rack_positions, tile_m)
+
+    placed_racks = [rack for rack in topology.racks if rack.rack_id in spine_distances]
+    cable_lengths: list[float] = []
+    selected_bins: list[int | None] = []
+    if placed_racks:
+        # Apply slack factor using shared helper, then bin every uplink run in one batch
         slack_factor = heuristics["slack_factor"]
-        cable_length = apply_slack(base_distance, slack_factor)
-
         dac_max = media_rules["qsfp28_100g"]["dac_max_m"]
         bins = media_rules["qsfp28_100g"]["bins_m"]
+        cable_lengths = [apply_slack(spine_distances[rack.rack_id], slack_factor) for rack in placed_racks]
+        selected_bins = select_length_bins_many(cable_lengths, bins)
 
-        # Select appropriate bin
-        selected_bin = select_length_bin(cable_length, bins)
-
+    for rack, cable_length, selected_bin in zip(placed_racks, cable_lengths, selected_bins):
         if selected_bin is None:
             # Distance exceeds all available bins
             findings.append(
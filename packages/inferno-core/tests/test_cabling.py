@@ -14,6 +14,7 @@ import csv
 from unittest.mock import patch
 
 import yaml
+from inferno_core.data.loader import SafeLoader
 
 # Import the functions we want to test
 from inferno_tools.cabling import (
@@ -26,7 +27,9 @@ from inferno_tools.cabling import (
     with_spares,
     calculate_cabling_bom,
 )
+from inferno_tools.cabling.cabling_bom import _aggregate_and_validate, _summarize_bom
 from inferno_core.data.cabling_policy import load_cabling_policy
+from inferno_core.models.network import NetworkTopology
 
 
 class TestManhattanDistance:
@@ -144,6 +147,14 @@ class TestSparesCalculation:
         result = with_spares(5, 0.50)
         assert result == 8  # 5 * 1.5 = 7.5, rounds up to 8
 
+    def test_with_spares_exact_multiple(self):
+        """Test that an exact product is not bumped up by float rounding."""
+        assert with_spares(400, 0.10) == 440  # 400 * 1.1 is 440.00000000000006 in floats
+
+    def test_with_spares_integer_ratio(self):
+        """Test spares given as a (num, den) ratio."""
+        assert with_spares(5, (1, 2)) == 8
+
 
 class TestBOMAggregation:
     """Test BOM aggregation functionality."""
@@ -179,6 +190,19 @@ class TestBOMAggregation:
         }
         assert bom == expected
 
+    def test_aggregate_returns_sorted_bom(self):
+        """Test that cable types and length bins come back in sorted order."""
+        links = [
+            {"cable_type": "RJ45 Cat6A", "length_bin": 3},
+            {"cable_type": "QSFP28 100G DAC", "length_bin": 2},
+            {"cable_type": "QSFP28 100G DAC", "length_bin": 1},
+        ]
+
+        bom = _aggregate_cable_bom(links, {}, 0.0, [1, 2, 3])
+
+        assert list(bom) == ["QSFP28 100G DAC", "RJ45 Cat6A"]
+        assert list(bom["QSFP28 100G DAC"]) == [1, 2]
+
 
 class TestPolicyLoading:
     """Test cabling policy loading."""
@@ -259,6 +283,18 @@ class TestValidation:
 
         assert any("Very long link: 150.0m" in w for w in warnings)
 
+    def test_validate_deduplicates_and_caps_link_warnings(self):
+        """Test that repeated link findings are reported once and the list is capped."""
+        topology = NetworkTopology.model_construct(spines=[{"id": "spine1"}], leafs=[{"id": "leaf1"}])
+        links = [{"distance_m": 15.0, "cable_type": "QSFP28 100G DAC"}] * 20
+        links += [{"distance_m": 20.0 + i, "cable_type": "QSFP28 100G DAC"} for i in range(60)]
+
+        warnings = _validate_bom(topology, [], [], links, {})
+
+        assert sum("15.0m" in w for w in warnings) == 1
+        assert len(warnings) == 51
+        assert warnings[-1] == "... and 11 more links with warnings suppressed"
+
 
 class TestExportFunctions:
     """Test BOM export functionality."""
@@ -276,8 +312,8 @@ class TestExportFunctions:
         assert export_path.exists()
 
         # Verify content
-        with open(export_path) as f:
-            data = yaml.safe_load(f)
+        with open(export_path, "rb") as f:
+            data = yaml.load(f, Loader=SafeLoader)
 
         assert "bom" in data
         assert "metadata" in data
@@ -309,6 +345,65 @@ class TestExportFunctions:
         expected_rows = [["QSFP28 100G DAC", "1", "2"], ["QSFP28 100G DAC", "2", "3"], ["RJ45 Cat6A", "3", "1"]]
         assert rows[1:] == expected_rows
 
+    def test_export_unsorted_bom_is_sorted(self, tmp_path):
+        """Test that both formats sort cable types and bins even when the caller's BOM is unsorted."""
+        bom = {"RJ45 Cat6A": {5: 1, 3: 4}, "QSFP28 100G DAC": {2: 3, 1: 2}}
+        policy = {"defaults": {"spares_fraction": 0.10}}
+
+        csv_path = tmp_path / "bom.csv"
+        _export_bom(bom, [], str(csv_path), "csv", policy)
+        with open(csv_path, newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        assert rows == [
+            ["QSFP28 100G DAC", "1", "2"],
+            ["QSFP28 100G DAC", "2", "3"],
+            ["RJ45 Cat6A", "3", "4"],
+            ["RJ45 Cat6A", "5", "1"],
+        ]
+
+        yaml_path = tmp_path / "bom.yaml"
+        _export_bom(bom, [], str(yaml_path), "yaml", policy)
+        text = yaml_path.read_text()
+        assert text.index("bom:") < text.index("metadata:")
+        assert text.index("QSFP28 100G DAC") < text.index("RJ45 Cat6A")
+        with open(yaml_path, "rb") as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        assert [list(bins) for bins in data["bom"].values()] == [[1, 2], [3, 5]]
+
+
+class TestAggregateAndValidate:
+    """Test the fused aggregation/validation pass."""
+
+    def test_matches_separate_passes(self):
+        """Test that the single pass yields the same BOM and warnings as the two separate ones."""
+        topology = NetworkTopology.model_construct(spines=[{"id": "spine1"}], leafs=[])
+        links = [
+            {"cable_type": "QSFP28 100G DAC", "length_bin": 1, "distance_m": 0.5},
+            {"cable_type": "QSFP28 100G DAC", "length_bin": 10, "distance_m": 12.0},
+            {"cable_type": "SFP28 25G Fiber", "length_bin": 10, "distance_m": 150.0},
+            {"cable_type": "SFP28 25G Fiber", "length_bin": 10, "distance_m": 150.0},
+        ]
+
+        bom, warnings = _aggregate_and_validate(topology, links, 0.10)
+
+        assert bom == _aggregate_cable_bom(links, {}, 0.10, [1, 10])
+        assert warnings == _validate_bom(topology, [], [], links, {})
+        assert len(warnings) == 3
+
+
+class TestRoundtripSummary:
+    """Test the BOM summary computed by roundtrip_bom."""
+
+    def test_summarize_bom(self):
+        """Test line-item and cable totals, including non-numeric quantities."""
+        bom = {"RJ45 Cat6A": {3: 1}, "QSFP28 100G DAC": {1: 2, 2: "3", 5: "n/a"}, "notes": "ignored"}
+
+        line_items, cables, cable_types = _summarize_bom(bom)
+
+        assert line_items == 4
+        assert cables == 6
+        assert cable_types == ["QSFP28 100G DAC", "RJ45 Cat6A", "notes"]
+
 
 class TestNetworkLinkBuilding:
     """Test network link building functionality."""
@@ -404,8 +499,8 @@ class TestIntegration:
         assert export_path.exists()
 
         # Verify the content structure
-        with open(export_path) as f:
-            data = yaml.safe_load(f)
+        with open(export_path, "rb") as f:
+            data = yaml.load(f, Loader=SafeLoader)
 
         assert "bom" in data
         assert "metadata" in data
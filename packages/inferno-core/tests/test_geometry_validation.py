@@ -54,6 +54,16 @@ class TestGeometryValidation:
 
         return topology, tors, nodes, site, policy
 
+    def test_load_policy_returns_private_copy(self, fixtures_path):
+        """Test that mutating a loaded policy does not leak into the next load of the same file."""
+        policy_path = str(fixtures_path / "far_racks" / "cabling-policy.yaml")
+
+        first = _load_policy(policy_path)
+        expected = first["media_rules"]["qsfp28_100g"]["bins_m"].copy()
+        first["media_rules"]["qsfp28_100g"]["bins_m"].append(1000)
+
+        assert _load_policy(policy_path)["media_rules"]["qsfp28_100g"]["bins_m"] == expected
+
     def test_boundary_equal_validation(self, fixtures_path):
         """Test boundary_equal fixture - should PASS with no findings."""
         topology, tors, nodes, site, policy = self._load_fixture_data("boundary_equal", fixtures_path)
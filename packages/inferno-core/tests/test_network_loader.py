@@ -5,7 +5,11 @@ Tests cover happy path, error cases, type coercion, and missing files
 as specified in TASK.cabling.loader.md.
 """
 
+import os
+from unittest.mock import patch
+
 import pytest
+import yaml
 from inferno_core.data.network_loader import (
     load_nodes,
     load_site,
@@ -435,3 +439,59 @@ class TestErrorHandling:
 
         with pytest.raises(ValueError):
             load_topology(null_file)
+
+
+class TestYamlCache:
+    """Test the mtime-keyed raw YAML cache shared by the loaders."""
+
+    def test_repeat_load_reuses_parsed_document(self, tmp_path):
+        """Test that an unchanged file is parsed once."""
+        site_file = tmp_path / "site.yaml"
+        site_file.write_text("racks:\n  - id: rack-1\n    grid: [0, 0]\n")
+
+        with patch("inferno_core.data.loader.yaml.load", wraps=yaml.load) as spy:
+            first = load_site(site_file)
+            second = load_site(site_file)
+
+        assert spy.call_count == 1
+        assert first == second
+
+    def test_modified_file_is_reparsed(self, tmp_path):
+        """Test that a rewritten file invalidates the cached document."""
+        site_file = tmp_path / "site.yaml"
+        site_file.write_text("racks:\n  - id: rack-1\n")
+        assert load_site(site_file).racks[0].id == "rack-1"
+
+        site_file.write_text("racks:\n  - id: rack-22\n")
+        os.utime(site_file, ns=(0, site_file.stat().st_mtime_ns + 1_000_000))
+
+        assert load_site(site_file).racks[0].id == "rack-22"
+
+    def test_clear_cache_forces_reparse(self, tmp_path):
+        """Test that clearing the cache makes the next load parse the file again."""
+        from inferno_core.data.loader import clear_yaml_cache
+
+        site_file = tmp_path / "site.yaml"
+        site_file.write_text("racks:\n  - id: rack-1\n")
+
+        with patch("inferno_core.data.loader.yaml.load", wraps=yaml.load) as spy:
+            load_site(site_file)
+            clear_yaml_cache()
+            load_site(site_file)
+
+        assert spy.call_count == 2
+
+    def test_dump_yaml_bytes_round_trips_through_reader(self, tmp_path):
+        """Test that the shared dumper writes block-style UTF-8 the raw reader parses back."""
+        from inferno_core.data.loader import _read_yaml_raw, dump_yaml_bytes
+
+        data = {"b": {"label": "Cat6A – 3m"}, "a": [1, 2]}
+        payload = dump_yaml_bytes(data, sort_keys=False)
+
+        assert payload.decode("utf-8").startswith("b:\n")
+        assert "–" in payload.decode("utf-8")
+        assert dump_yaml_bytes(data).decode("utf-8").startswith("a:\n")
+
+        bom_file = tmp_path / "doc.yaml"
+        bom_file.write_bytes(payload)
+        assert _read_yaml_raw(bom_file) == data
@@ -8,6 +8,8 @@ from pathlib import Path
 
 import pytest
 import yaml
+from inferno_core.data.cabling_policy import load_cabling_policy_typed
+from inferno_core.data.loader import SafeLoader
 from inferno_core.validation.cabling import validate_policy_sanity
 
 
@@ -22,8 +24,8 @@ class TestPolicyValidation:
     def load_policy_fixture(self, fixtures_dir: Path, filename: str) -> dict:
         """Load a policy fixture file."""
         fixture_path = fixtures_dir / filename
-        with open(fixture_path, "r") as f:
-            return yaml.safe_load(f)
+        with open(fixture_path, "rb") as f:
+            return yaml.load(f, Loader=SafeLoader)
 
     def test_happy_path_no_findings(self, fixtures_dir):
         """Test valid policy produces no findings."""
@@ -262,3 +264,28 @@ class TestPolicyValidationIntegration:
         # Verify functions exist
         assert callable(run_cabling_validation)
         assert callable(validate_policy_sanity)
+
+
+class TestPolicyLoaderCache:
+    """Test memoization of the typed policy loader."""
+
+    def test_same_file_returns_shared_model(self, tmp_path):
+        """Test that repeat loads of an unchanged policy reuse one model."""
+        policy_file = tmp_path / "cabling-policy.yaml"
+        policy_file.write_text("defaults:\n  spares_fraction: 0.2\n")
+
+        first = load_cabling_policy_typed(policy_file)
+        second = load_cabling_policy_typed(str(policy_file))
+
+        assert first is second
+        assert first.defaults.spares_fraction == 0.2
+
+    def test_edited_file_is_reloaded(self, tmp_path):
+        """Test that a modified policy file is not served from the cache."""
+        policy_file = tmp_path / "cabling-policy.yaml"
+        policy_file.write_text("defaults:\n  spares_fraction: 0.2\n")
+        load_cabling_policy_typed(policy_file)
+
+        policy_file.write_text("defaults:\n  spares_fraction: 0.35\n")
+
+        assert load_cabling_policy_typed(policy_file).defaults.spares_fraction == 0.35
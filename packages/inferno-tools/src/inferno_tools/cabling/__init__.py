@@ -1,6 +1,14 @@
 """Cabling tools package."""
 
-from .common import with_spares, calculate_manhattan_distance, select_cable_type_and_bin, build_network_links
+from .common import (
+    with_spares,
+    with_spares_many,
+    calculate_manhattan_distance,
+    select_length_bins_many,
+    select_cable_type_and_bin,
+    build_network_links,
+    NetworkLink,
+)
 from .cabling_bom import _aggregate_cable_bom, _validate_bom, _export_bom, calculate_cabling_bom, roundtrip_bom
 from .estimate_cabling_heuristic import estimate_cabling_heuristic
 from .cross_validate import cross_validate_bom
@@ -8,11 +16,14 @@ from .cross_validate import cross_validate_bom
 __all__ = [
     "_aggregate_cable_bom",
     "build_network_links",
+    "NetworkLink",
     "calculate_manhattan_distance",
     "_export_bom",
     "select_cable_type_and_bin",
+    "select_length_bins_many",
     "_validate_bom",
     "with_spares",
+    "with_spares_many",
     "calculate_cabling_bom",
     "cross_validate_bom",
     "estimate_cabling_heuristic",
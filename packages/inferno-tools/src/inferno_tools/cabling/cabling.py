@@ -1,6 +1,6 @@
 from typing import Optional
 
-from . import estimate_cabling_heuristic
+from .estimate_cabling_heuristic import estimate_cabling_heuristic
 from rich.console import Console
 
 console = Console()
@@ -61,8 +61,3 @@ def estimate_cabling(
         wan_cat6a=trunk_cables,
         include_spine_links=include_spine_links,
     )
-
-
-# ----------------------------
-# roundtrip_bom: BOM summary and roundtrip YAML
-# ----------------------------
@@ -1,5 +1,7 @@
-import csv
-from typing import List, Optional, Dict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Dict, Tuple
 
 from inferno_core.codebase.debug import spy_trace
 from inferno_core.models.cable_bom import CableBOMSummary
@@ -8,15 +10,25 @@ from inferno_core.models.tor import Tor
 from inferno_core.models.records import NodeRec
 from inferno_core.models.records import SiteRec
 from inferno_core.models.cabling_policy import CablingPolicy, MediaLabels, MediaRule
-from inferno_core.models.records import LinkRec
 
-from inferno_core.data.cabling_policy import load_cabling_policy_typed
+from inferno_core.data.cabling_policy import clear_policy_cache, load_cabling_policy_typed
+from inferno_core.data.loader import _read_yaml_raw, clear_yaml_cache, dump_yaml_bytes
 from inferno_core.data.network import load_network_topology
 from inferno_core.data.network_loader import load_site, load_nodes
 from inferno_core.data.tors import load_tors_typed
-from inferno_tools.cabling import with_spares, build_network_links
+from inferno_tools.cabling import with_spares_many, build_network_links, NetworkLink
+from inferno_tools.cabling.common import precompute_bins
 from inferno_tools.cabling.cabling import console
 
+# Cap on distinct per-link validation warnings; beyond it a single "... N more" line is reported.
+_MAX_LINK_WARNINGS = 50
+
+
+def clear_cache() -> None:
+    """Forget every manifest, policy and BOM parsed by earlier runs (e.g. between tests)."""
+    clear_yaml_cache()
+    clear_policy_cache()
+
 
 @spy_trace
 def _get(obj, key, default=None):
@@ -27,100 +39,225 @@ def _get(obj, key, default=None):
     return default
 
 
-@spy_trace
-def _getitem(obj, key, default=None):
-    try:
-        if isinstance(obj, dict):
-            return obj.get(key, default)
-        return getattr(obj, key)
-    except Exception:
-        return default
+class PolicyMeta(NamedTuple):
+    """The policy fields recorded in BOM export metadata, extracted once per run."""
+
+    version: Any
+    spares_fraction: Any
+    slack_factor: Any
+
+
+def policy_meta(policy: CablingPolicy) -> PolicyMeta:
+    """Pull the export metadata out of a policy model (or a legacy policy dict)."""
+    defaults = _get(policy, "defaults", None)
+    heuristics = _get(policy, "heuristics", None)
+    return PolicyMeta(
+        version=_get(policy, "version", "unknown"),
+        spares_fraction=_get(defaults, "spares_fraction", 0.1),
+        slack_factor=_get(heuristics, "slack_factor", 1.2),
+    )
+
+
+def _link_getter(links: List[NetworkLink]) -> Callable[..., Any]:
+    """Pick a field accessor once for a batch of links.
+
+    Links in a batch share one shape (NetworkLink from build_network_links, or plain dicts in
+    older callers), so the dict-vs-attribute dispatch is resolved from the first item instead of
+    per link and per field.
+    """
+    if links and isinstance(links[0], dict):
+        return lambda link, key, default=None: link.get(key, default)
+    return lambda link, key, default=None: getattr(link, key, default)
 
 
 # links: [{'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 0.0, 'from': 'spine-1:eth1/1', 'length_bin': 1, 'to': 'tor-west-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/2', 'length_bin': 2, 'to': 'tor-east-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/3', 'length_bin': 2, 'to': 'tor-north-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 2.0, 'from': 'spine-1:eth1/4', 'length_bin': 3, 'to': 'tor-crypt-1:qsfp28-1', 'type': '100G'}]
 
 
-def _aggregate_cable_bom(
-    links: List[LinkRec], policy: CablingPolicy, spares_fraction: float, length_bins_m: List[int]
-) -> Dict[str, Dict[int, int]]:
+def _bom_from_counts(raw_counts: Counter[Tuple[Any, Any]], spares_fraction: float) -> Dict[str, Dict[int, int]]:
+    """Turn raw (cable_type, length_bin) link counts into the nested BOM, spares included."""
+    # Normalize only the distinct keys, not every link.
+    counts: Counter[Tuple[str, int]] = Counter()
+    for (cable_type, length_bin), qty in raw_counts.items():
+        if cable_type is not None and length_bin is not None:
+            counts[(str(cable_type), int(length_bin))] += qty
+    # Spares are applied while materializing the nested BOM, so it is built in a single pass. Keys are
+    # inserted in (cable_type, length_bin) order so exporters can iterate the result as is.
+    keys = sorted(counts)
     bom: Dict[str, Dict[int, int]] = {}
-    for (
-        link
-    ) in (
-        links
-    ):  # {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 0.0, 'from': 'spine-1:eth1/1', 'length_bin': 1, 'to': 'tor-west-1:qsfp28-1', 'type': '100G'}
-        cable_type = _getitem(link, "cable_type")
-        length_bin = _getitem(link, "length_bin")
-        if cable_type is None or length_bin is None:
-            continue
-        bom.setdefault(str(cable_type), {})
-        bom[str(cable_type)][int(length_bin)] = bom[str(cable_type)].get(int(length_bin), 0) + 1
-    for ctype, bins in bom.items():
-        for b, qty in list(bins.items()):
-            bins[b] = with_spares(qty, spares_fraction)
+    for (cable_type, length_bin), qty in zip(keys, with_spares_many([counts[k] for k in keys], spares_fraction)):
+        bom.setdefault(cable_type, {})[length_bin] = qty
     return bom
 
 
+def _aggregate_cable_bom(
+    links: List[NetworkLink], policy: CablingPolicy, spares_fraction: float, length_bins_m: List[int]
+) -> Dict[str, Dict[int, int]]:
+    # Counter() consumes the iterable in its C counting loop rather than a Python-level `+= 1` per link.
+    get = _link_getter(links)
+    raw_counts = Counter((get(link, "cable_type"), get(link, "length_bin")) for link in links)
+    return _bom_from_counts(raw_counts, spares_fraction)
+
+
+def _topology_warnings(topology: NetworkTopology) -> List[str]:
+    warnings: List[str] = []
+    if not topology.spines:
+        warnings.append("No spines defined in topology")
+    if not topology.leafs:
+        warnings.append("No leafs defined in topology")
+    return warnings
+
+
+class _LinkFindings:
+    """Collects the per-link validation findings for links longer than 10m.
+
+    Many links tend to share one misconfiguration, so each (rule, rounded distance) is kept once and
+    messages are only formatted for the unique findings. At most _MAX_LINK_WARNINGS are kept, so a
+    pathological fabric costs a counter rather than memory per distinct distance.
+    """
+
+    __slots__ = ("_findings", "_is_dac", "_suppressed")
+
+    def __init__(self) -> None:
+        # Only a handful of distinct cable types exist, so classify each once rather than per link
+        self._is_dac: Dict[Any, bool] = {}
+        self._findings: Dict[Tuple[bool, float], None] = {}
+        self._suppressed = 0
+
+    def check(self, cable_type: Any, distance: float) -> None:
+        dac = self._is_dac.get(cable_type)
+        if dac is None:
+            dac = self._is_dac[cable_type] = "DAC" in str(cable_type)
+        if not dac and distance <= 100:
+            return
+        key = (dac, round(distance, 1))
+        if key in self._findings:
+            return
+        if len(self._findings) < _MAX_LINK_WARNINGS:
+            self._findings[key] = None
+        else:
+            self._suppressed += 1
+
+    def warnings(self) -> List[str]:
+        warnings = [
+            (
+                f"DAC cable selected for {distance:.1f}m link (max recommended: 3m)"
+                if dac
+                else f"Very long link: {distance:.1f}m may exceed cable specifications"
+            )
+            for dac, distance in self._findings
+        ]
+        if self._suppressed:
+            warnings.append(f"... and {self._suppressed} more links with warnings suppressed")
+        return warnings
+
+
 def _validate_bom(
     topology: NetworkTopology,
     tors: List[Tor],
     nodes: List[NodeRec],
-    links: List[dict[str, str | int | float | None]],
+    links: List[NetworkLink],
     policy: CablingPolicy,
 ) -> List[str]:
     """
 
     :type links: [{'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 0.0, 'from': 'spine-1:eth1/1', 'length_bin': 1, 'to': 'tor-west-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/2', 'length_bin': 2, 'to': 'tor-east-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/3', 'length_bin': 2, 'to': 'tor-north-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 2.0, 'from': 'spine-1:eth1/4', 'length_bin': 3, 'to': 'tor-crypt-1:qsfp28-1', 'type': '100G'}]
     """
-    warnings: List[str] = []
-    spines = topology.spines if topology.spines else []
-    leafs = topology.leafs if topology.leafs else []
-    if not spines:
-        warnings.append("No spines defined in topology")
-    if not leafs:
-        warnings.append("No leafs defined in topology")
-    for link in links:
-        distance = _getitem(link, "distance_m", 0.0) or 0.0
-        cable_type = str(_getitem(link, "cable_type", ""))
-        if distance > 10 and "DAC" in cable_type:
-            warnings.append(f"DAC cable selected for {distance:.1f}m link (max recommended: 3m)")
-        elif distance > 100:
-            warnings.append(f"Very long link: {distance:.1f}m may exceed cable specifications")
+    warnings = _topology_warnings(topology)
+    # Both rules need distance > 10m, so a fabric whose longest link is within that has nothing to report
+    get = _link_getter(links)
+    distances = [get(link, "distance_m", 0.0) or 0.0 for link in links]
+    if distances and max(distances) > 10:
+        findings = _LinkFindings()
+        for link, distance in zip(links, distances):
+            if distance > 10:
+                findings.check(get(link, "cable_type", ""), distance)
+        warnings.extend(findings.warnings())
     return warnings
 
 
+def _aggregate_and_validate(
+    topology: NetworkTopology, links: List[NetworkLink], spares_fraction: float
+) -> Tuple[Dict[str, Dict[int, int]], List[str]]:
+    """_aggregate_cable_bom and _validate_bom in a single pass over the links.
+
+    Each link's cable_type, length_bin and distance_m are read once, for both the counts and the checks.
+    """
+    get = _link_getter(links)
+    raw_counts: Counter[Tuple[Any, Any]] = Counter()
+    findings = _LinkFindings()
+    for link in links:
+        cable_type = get(link, "cable_type")
+        raw_counts[(cable_type, get(link, "length_bin"))] += 1
+        distance = get(link, "distance_m", 0.0) or 0.0
+        if distance > 10:
+            findings.check(cable_type, distance)
+    return _bom_from_counts(raw_counts, spares_fraction), _topology_warnings(topology) + findings.warnings()
+
+
 def _export_bom(
-    bom: Dict[str, Dict[int, int]], warnings: List[str], export_path: str, export_format: str, policy: CablingPolicy
+    bom: Dict[str, Dict[int, int]],
+    warnings: List[str],
+    export_path: str,
+    export_format: str,
+    policy: PolicyMeta | CablingPolicy,
 ) -> None:
-    # derive metadata from model-ish policy
-    version = _get(policy, "version", "unknown")
-    defaults = _get(policy, "defaults", None)
-    heuristics = _get(policy, "heuristics", None)
-    spares_fraction = _get(defaults, "spares_fraction", 0.1)
-    slack_factor = _get(heuristics, "slack_factor", 1.2)
+    """Write the BOM as CSV or YAML, with cable types and length bins in sorted order.
+
+    ``policy`` is normally the PolicyMeta computed by the caller; a policy model or dict is still accepted.
+    """
+    meta = policy if isinstance(policy, PolicyMeta) else policy_meta(policy)
+    # Sort here rather than trusting the caller's order; a BOM has only a handful of types and bins
+    bom = {cable_type: dict(sorted(bom[cable_type].items())) for cable_type in sorted(bom)}
 
+    # Keys are listed in sorted order: the YAML export relies on insertion order instead of sort_keys.
     metadata = {
         "generated_by": "inferno-cli tools cabling calculate",
-        "policy_applied": version,
-        "spares_fraction": spares_fraction,
-        "slack_factor": slack_factor,
+        "policy_applied": meta.version,
+        "slack_factor": meta.slack_factor,
+        "spares_fraction": meta.spares_fraction,
         "warnings": warnings,
     }
 
     if export_format.lower() == "csv":
-        with open(export_path, "w", newline="") as csvfile:
+        import csv  # only the CSV export needs it
+
+        # A 1 MiB buffer lets writerows() hand the OS a few large writes instead of one per default-sized chunk
+        with open(export_path, "w", newline="", buffering=1 << 20) as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(["Cable Type", "Length Bin (m)", "Quantity"])
-            for cable_type in sorted(bom.keys()):
-                for length_bin in sorted(bom[cable_type].keys()):
-                    writer.writerow([cable_type, length_bin, bom[cable_type][length_bin]])
+            writer.writerows(
+                (cable_type, length_bin, qty) for cable_type, bins in bom.items() for length_bin, qty in bins.items()
+            )
     else:
-        # local import to keep yaml scoped to this function only
-        import yaml  # type: ignore
+        # Every mapping is already in sorted order, so the emitter need not sort any of them.
+        output_data = {"bom": bom, "metadata": metadata}
+        # Emit the whole document in memory and write it out once, rather than through the
+        # emitter's many small writes to the file object.
+        Path(export_path).write_bytes(dump_yaml_bytes(output_data, sort_keys=False))
 
-        output_data = {"metadata": metadata, "bom": bom}
-        with open(export_path, "w") as yamlfile:
-            yaml.dump(output_data, yamlfile, default_flow_style=False, sort_keys=True)
+
+def _load_inputs(
+    topology_path: str, tors_path: str, nodes_path: str, site_path: Optional[str], policy_path: str
+) -> Tuple[NetworkTopology, List[Tor], List[NodeRec], Optional[SiteRec], CablingPolicy]:
+    """Load the BOM input manifests concurrently.
+
+    The five files are independent, so their reads and parses overlap on a small thread pool.
+    An exception from any loader propagates unchanged from its future.
+    """
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        topology = pool.submit(load_network_topology, topology_path)
+        tors = pool.submit(load_tors_typed, tors_path)
+        nodes = pool.submit(load_nodes, nodes_path)
+        # load_site already maps a missing file to None; only an unset path needs guarding here
+        site = pool.submit(load_site, site_path) if site_path else None
+        policy = pool.submit(load_cabling_policy_typed, policy_path)
+        return (
+            topology.result(),
+            tors.result(),
+            nodes.result(),
+            site.result() if site is not None else None,
+            policy.result(),
+        )
 
 
 @spy_trace
@@ -143,51 +280,69 @@ def calculate_cabling_bom(
     """
     console.print("\n[bold cyan]Cabling BOM Calculator[/bold cyan]")
 
-    topology = load_network_topology(topology_path)
-    tors = load_tors_typed(tors_path)
-    nodes = load_nodes(nodes_path)
-    site = load_site(site_path)
-    policy = load_cabling_policy_typed(policy_path)
+    # The ToR and node manifests are not needed for the BOM itself, but are still loaded so a broken one fails the run
+    topology, _, _, site, policy = _load_inputs(topology_path, tors_path, nodes_path, site_path, policy_path)
+    meta = policy_meta(policy)
 
     console.print(f"[green]✓[/green] Loaded topology: {len(topology.leafs)} ToRs, {len(topology.spines)} spines")
-    site_racks = site.racks if isinstance(site.racks, list) else []
+    site_racks = site.racks if site is not None and isinstance(site.racks, list) else []
     console.print(f"[green]✓[/green] Loaded site: {len(site_racks)} racks")
 
     # Build network graph and calculate distances
     links = build_network_links(
-        topology, site, policy
+        topology, site, policy, precompute_bins(length_bins_m)
     )  # [{'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 0.0, 'from': 'spine-1:eth1/1', 'length_bin': 1, 'to': 'tor-west-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/2', 'length_bin': 2, 'to': 'tor-east-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 1.0, 'from': 'spine-1:eth1/3', 'length_bin': 2, 'to': 'tor-north-1:qsfp28-1', 'type': '100G'}, {'cable_type': 'QSFP28 100G DAC', 'category': 'spine_to_leaf', 'distance_m': 2.0, 'from': 'spine-1:eth1/4', 'length_bin': 3, 'to': 'tor-crypt-1:qsfp28-1', 'type': '100G'}]
     console.print(f"[green]✓[/green] Calculated {len(links)} network links")
 
-    # Aggregate by cable type and length bin
-    bom = _aggregate_cable_bom(links, policy, spares_fraction, length_bins_m)
+    # Aggregate by cable type and length bin, validating the links in the same pass
+    bom, warnings = _aggregate_and_validate(topology, links, spares_fraction)
     console.print(f"[green]√[/green] Aggregated BOM into {len(bom)} cable types and {len(links)} length bins")
 
-    # Validate the results
-    warnings = _validate_bom(topology, tors, nodes, links, policy)
     if warnings:
-        console.print(f"[yellow]⚠[/yellow]  {len(warnings)} validation warnings")
-        for warning in warnings:
-            console.print(f"  [yellow]•[/yellow] {warning}")
+        # One render pass for the whole block instead of one console.print per warning
+        console.print(
+            "\n".join(
+                [f"[yellow]⚠[/yellow]  {len(warnings)} validation warnings"]
+                + [f"  [yellow]•[/yellow] {warning}" for warning in warnings]
+            )
+        )
     else:
         console.print(f"[green]✓[/green] Cable BOM generated with no validation warnings.")
 
     # Export the BOM
-    _export_bom(bom, warnings, export_path, export_format, policy)
+    _export_bom(bom, warnings, export_path, export_format, meta)
     console.print(f"[green]✓[/green] Exported BOM to {export_path}")
 
 
+def _as_quantity(value: Any) -> int:
+    """int(value), counting anything that is not a quantity (hand-edited BOMs) as 0."""
+    try:
+        return int(value)
+    except Exception:
+        return 0
+
+
+def _summarize_bom(bom_dict: Dict[Any, Any]) -> Tuple[int, int, List[Any]]:
+    """Return (line items, total cables, sorted cable types) for a ``cable_type -> {bin: qty}`` BOM."""
+    # Flatten the quantities into a single column, then reduce it with one sum(). Exported BOMs hold
+    # plain ints, so int() is only called for values that are not already ints.
+    quantities = [qty for bins in bom_dict.values() if isinstance(bins, dict) for qty in bins.values()]
+    try:
+        total_cables = sum(qty if type(qty) is int else int(qty) for qty in quantities)
+    except Exception:
+        total_cables = sum(_as_quantity(qty) for qty in quantities)
+    return len(quantities), total_cables, sorted(bom_dict)
+
+
 @spy_trace
 def roundtrip_bom(*, bom_path: str, export_path: str, strict: bool = False) -> CableBOMSummary:
     """
     Reads a BOM YAML file, computes a summary, and writes a summary YAML to export_path.
     Raises RuntimeError if the BOM file is missing or invalid.
     """
-    from pathlib import Path
-    import yaml
-
     try:
-        raw = yaml.safe_load(Path(bom_path).read_text(encoding="utf-8"))
+        # Shared with the manifest loaders: an unchanged BOM file is parsed only once per process
+        raw = _read_yaml_raw(bom_path)
     except Exception as e:
         raise RuntimeError(f"Failed to load BOM file '{bom_path}': {e}")
     if not isinstance(raw, dict) or not raw:
@@ -195,20 +350,7 @@ def roundtrip_bom(*, bom_path: str, export_path: str, strict: bool = False) -> C
     bom_dict = raw.get("bom") if isinstance(raw.get("bom"), dict) else raw
     if not isinstance(bom_dict, dict) or not bom_dict:
         raise RuntimeError(f"BOM file '{bom_path}' does not contain a valid BOM dictionary.")
-    # Compute summary
-    total_line_items = 0
-    total_cables = 0
-    cable_types_set = set()
-    for cable_type, bins in bom_dict.items():
-        cable_types_set.add(cable_type)
-        if isinstance(bins, dict):
-            for bin_qty in bins.values():
-                total_line_items += 1
-                try:
-                    total_cables += int(bin_qty)
-                except Exception:
-                    pass
-    cable_types = sorted(cable_types_set)
+    total_line_items, total_cables, cable_types = _summarize_bom(bom_dict)
     output = {
         "metadata": {
             "generated_by": "inferno-tools.cabling.roundtrip_bom",
@@ -225,6 +367,5 @@ def roundtrip_bom(*, bom_path: str, export_path: str, strict: bool = False) -> C
 
     # Ensure parent directory exists
     Path(export_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(export_path, "w", encoding="utf-8") as f:
-        yaml.dump(output, f, default_flow_style=False, sort_keys=True)
+    Path(export_path).write_bytes(dump_yaml_bytes(output))
     return CableBOMSummary.from_dict(output)
@@ -5,18 +5,30 @@ and length bin selection to ensure consistency between calculation and validatio
 """
 
 import math
-from typing import Sequence, List, Dict, Any, Tuple, Optional
-
-from inferno_core.models.cabling_policy import CablingPolicy
+import sys
+import weakref
+from bisect import bisect_left
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Iterable, Sequence, List, Dict, Any, Tuple, Optional
+
+from inferno_core.models.cabling_policy import CablingPolicy, Heuristics, MediaLabels, MediaRule
 from inferno_core.models.network import NetworkTopology
 from inferno_core.models.records import SiteRec
 
 U_PITCH_M = 0.04445  # 1.75 in per U
 
+# Bins used by build_network_links/compile_policy when the caller does not pass its own.
+_DEFAULT_LENGTH_BINS_M = (1, 2, 3, 5, 7, 10)
+
 
 def compute_rack_distance_m(grid_a: tuple[int, int], grid_b: tuple[int, int], tile_m: float) -> float:
     """Compute Manhattan distance between two rack grid positions in meters.
 
+    Scalar API for one-off lookups; when measuring from one position to many racks,
+    use `compute_rack_distances_m` instead.
+
     Args:
         grid_a: Grid position (x, y) of first rack
         grid_b: Grid position (x, y) of second rack
@@ -30,6 +42,21 @@ def compute_rack_distance_m(grid_a: tuple[int, int], grid_b: tuple[int, int], ti
     return (dx + dy) * tile_m
 
 
+def compute_rack_distances_m(origin: Sequence[int], grids: Dict[str, Sequence[int]], tile_m: float) -> Dict[str, float]:
+    """Compute Manhattan distances from one grid position to many racks in a single pass.
+
+    Args:
+        origin: Grid position (x, y) to measure from
+        grids: Rack id -> grid position (x, y)
+        tile_m: Size of each grid tile in meters
+
+    Returns:
+        Rack id -> distance in meters, equal to compute_rack_distance_m for each pair
+    """
+    ox, oy = origin[0], origin[1]
+    return {rack_id: (abs(grid[0] - ox) + abs(grid[1] - oy)) * tile_m for rack_id, grid in grids.items()}
+
+
 def apply_slack(distance_m: float, slack_factor: float) -> float:
     """Apply slack factor to physical distance.
 
@@ -43,24 +70,92 @@ def apply_slack(distance_m: float, slack_factor: float) -> float:
     return distance_m * slack_factor
 
 
+def precompute_bins(bins_m: Iterable[int]) -> Tuple[int, ...]:
+    """Sort and de-duplicate length bins once so lookups can bisect them."""
+    return tuple(sorted(set(bins_m)))
+
+
+@lru_cache(maxsize=8)
+def _sorted_bins(bins_m: Tuple[int, ...]) -> Tuple[int, ...]:
+    return precompute_bins(bins_m)
+
+
+# The default bins are already sorted and unique; callers passing this very tuple skip sorting and caching.
+_DEFAULT_BINS_SORTED = precompute_bins(_DEFAULT_LENGTH_BINS_M)
+
+
 def select_length_bin(distance_m: float, bins_m: Sequence[int]) -> int | None:
     """Select the smallest bin that can accommodate the given distance.
 
     Args:
         distance_m: Required cable length in meters
-        bins_m: Available length bins in meters
+        bins_m: Available length bins in meters, in any order (sorted once per distinct set of bins)
 
     Returns:
         Selected bin length in meters, or None if no suitable bin found
     """
-    for b in sorted(bins_m):
-        if distance_m <= b:
-            return b
-    return None
+    if bins_m is _DEFAULT_LENGTH_BINS_M:
+        sorted_bins = _DEFAULT_BINS_SORTED
+    else:
+        sorted_bins = _sorted_bins(bins_m if isinstance(bins_m, tuple) else tuple(bins_m))
+    return select_length_bin_sorted(distance_m, sorted_bins)
+
+
+def select_length_bin_sorted(distance_m: float, sorted_bins_m: Sequence[int]) -> int | None:
+    """`select_length_bin` for bins already in ascending order (e.g. from `precompute_bins`).
+
+    Skips normalizing the bins entirely; the result is undefined if they are not sorted.
+    """
+    i = bisect_left(sorted_bins_m, distance_m)
+    return sorted_bins_m[i] if i < len(sorted_bins_m) else None
 
 
-def with_spares(count: int, spares_fraction: float) -> int:
-    return math.ceil(count * (1.0 + spares_fraction))
+def select_length_bins_many(distances_m: Iterable[float], bins_m: Sequence[int]) -> List[int | None]:
+    """`select_length_bin` over a whole column of distances, normalizing the bins once."""
+    if bins_m is _DEFAULT_LENGTH_BINS_M:
+        sorted_bins = _DEFAULT_BINS_SORTED
+    else:
+        sorted_bins = _sorted_bins(bins_m if isinstance(bins_m, tuple) else tuple(bins_m))
+    n = len(sorted_bins)
+    out: List[int | None] = []
+    for distance_m in distances_m:
+        i = bisect_left(sorted_bins, distance_m)
+        out.append(sorted_bins[i] if i < n else None)
+    return out
+
+
+SparesFraction = float | Fraction | Tuple[int, int]
+
+
+@lru_cache(maxsize=32)
+def _spares_ratio(spares_fraction: SparesFraction) -> Tuple[int, int]:
+    """Return ``(num, den)`` with ``num / den == 1 + spares_fraction`` exactly.
+
+    Floats are read as the decimal they print as (0.1 -> 1/10), not their binary value, so
+    e.g. 400 cables at 10% spares is 440 rather than the 441 a float ceil produces.
+    """
+    if isinstance(spares_fraction, tuple):
+        num, den = spares_fraction
+    else:
+        frac = spares_fraction if isinstance(spares_fraction, Fraction) else Fraction(str(spares_fraction))
+        num, den = frac.numerator, frac.denominator
+    return den + num, den
+
+
+def with_spares(count: int, spares_fraction: SparesFraction) -> int:
+    """``ceil(count * (1 + spares_fraction))`` in exact integer arithmetic.
+
+    ``spares_fraction`` may be a float, a Fraction, or a ``(num, den)`` tuple.
+    """
+    num, den = _spares_ratio(spares_fraction)
+    return (count * num + den - 1) // den
+
+
+def with_spares_many(counts: Iterable[int], spares_fraction: SparesFraction) -> List[int]:
+    """`with_spares` over a whole column of counts, resolving the spares ratio once."""
+    num, den = _spares_ratio(spares_fraction)
+    round_up = den - 1
+    return [(count * num + round_up) // den for count in counts]
 
 
 def calculate_manhattan_distance(rack1_grid: List[int], rack2_grid: List[int], tile_m: float = 1.0) -> float:
@@ -68,54 +163,162 @@ def calculate_manhattan_distance(rack1_grid: List[int], rack2_grid: List[int], t
     return compute_rack_distance_m((rack1_grid[0], rack1_grid[1]), (rack2_grid[0], rack2_grid[1]), tile_m)
 
 
-def select_cable_type_and_bin(
-    distance_m: float, link_type: str, policy: CablingPolicy, length_bins_m: List[int]
-) -> Tuple[str, int]:
-    """Select cable type and length bin based on distance and policy."""
-    # Apply slack factor
-    slack_factor = policy.heuristics.slack_factor  # 1.2
-    adjusted_distance = apply_slack(distance_m, slack_factor)
-
-    # Find appropriate length bin
-    selected_bin = select_length_bin(adjusted_distance, length_bins_m)  # 1
-
-    if selected_bin is None:
-        selected_bin = max(length_bins_m)  # Use largest bin if distance exceeds all bins
-
-    # Determine cable type based on link type and distance
-    media_rules = policy.media_rules
-
-    if link_type == "25G":
-        rules = media_rules.get("sfp28_25g", {})
-        dac_max = rules.dac_max_m
-        if adjusted_distance <= dac_max:
-            cable_type = rules.labels.dac
-        elif adjusted_distance <= 10:
-            cable_type = rules.labels.aoc
-        else:
-            cable_type = rules.labels.fiber
-    elif link_type == "100G":
-        rules = media_rules.get("qsfp28_100g", {})
-        dac_max = rules.dac_max_m
-        if adjusted_distance <= dac_max:
-            cable_type = rules.labels.dac
-        elif adjusted_distance <= 10:
-            cable_type = rules.labels.aoc
+# Link type -> policy media_rules key.
+_MEDIA_RULE_KEYS = {"25G": "sfp28_25g", "100G": "qsfp28_100g", "RJ45": "rj45_cat6a"}
+
+# Past this (slacked) length a non-DAC link switches from AOC to fiber.
+_AOC_MAX_M = 10
+
+MediaTable = Dict[str, Tuple[float, str, str, str]]
+
+
+def compile_media_rules(policy: CablingPolicy) -> MediaTable:
+    """Flatten policy media rules into ``link_type -> (dac_max_m, dac, aoc, fiber)`` labels.
+
+    RJ45 has a single label, so it is stored in every slot with an infinite DAC reach.
+    Build this once per run instead of walking ``policy.media_rules`` for every link.
+    Labels are interned: every link of a type shares one string object, and repeated
+    compiles of the same policy hand out the same objects, so BOM keys hash and compare cheaply.
+    """
+    table: MediaTable = {}
+    for link_type, rule_key in _MEDIA_RULE_KEYS.items():
+        rules = policy.media_rules.get(rule_key) or MediaRule()
+        labels = rules.labels or MediaLabels()
+        unknown = f"Unknown {link_type}"
+        if link_type == "RJ45":
+            label = sys.intern(labels.label or unknown)
+            table[link_type] = (math.inf, label, label, label)
         else:
-            cable_type = rules.labels.fiber
-    elif link_type == "RJ45":
-        rules = media_rules.get("rj45_cat6a", {})
-        cable_type = rules.labels.rj45
-    else:
-        cable_type = f"Unknown {link_type}"
+            dac_max = rules.dac_max_m if rules.dac_max_m is not None else 0.0
+            table[link_type] = (
+                dac_max,
+                sys.intern(labels.dac or unknown),
+                sys.intern(labels.aoc or unknown),
+                sys.intern(labels.fiber or unknown),
+            )
+    return table
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledPolicy:
+    """Flat, read-only view of the policy values consulted for every link."""
+
+    tile_m: float
+    slack_factor: float
+    same_rack_leaf_to_node_m: float
+    adjacent_rack_leaf_to_spine_m: float
+    spares_fraction: float
+    media: MediaTable
+    bins_sorted: Tuple[int, ...]
+
+
+def compile_policy(policy: CablingPolicy, length_bins_m: Sequence[int] = _DEFAULT_LENGTH_BINS_M) -> CompiledPolicy:
+    """Resolve policy defaults and media rules once, ahead of the per-link loops."""
+    heuristics = policy.heuristics or Heuristics()
+    return CompiledPolicy(
+        tile_m=heuristics.tile_m,
+        slack_factor=heuristics.slack_factor,
+        same_rack_leaf_to_node_m=heuristics.same_rack_leaf_to_node_m,
+        adjacent_rack_leaf_to_spine_m=heuristics.adjacent_rack_leaf_to_spine_m,
+        spares_fraction=policy.defaults.spares_fraction,
+        media=compile_media_rules(policy),
+        bins_sorted=_DEFAULT_BINS_SORTED if length_bins_m is _DEFAULT_LENGTH_BINS_M else precompute_bins(length_bins_m),
+    )
+
+
+def _select_cable_type_and_bin(distance_m: float, link_type: str, compiled: CompiledPolicy) -> Tuple[str, int]:
+    """Hot-path variant of `select_cable_type_and_bin` over a precompiled policy."""
+    adjusted_distance = apply_slack(distance_m, compiled.slack_factor)
+
+    # Smallest bin >= distance; bins are sorted once in compile_policy so a bisect suffices
+    bins_sorted = compiled.bins_sorted
+    i = bisect_left(bins_sorted, adjusted_distance)
+    selected_bin = bins_sorted[i] if i < len(bins_sorted) else bins_sorted[-1]  # Largest bin if all are too short
+
+    rule = compiled.media.get(link_type)
+    if rule is None:
+        # Interned like the compiled labels, so every link of an unknown type shares one string
+        return sys.intern(f"Unknown {link_type}"), selected_bin
+
+    dac_max, dac_label, aoc_label, fiber_label = rule
+    if adjusted_distance <= dac_max:
+        return dac_label, selected_bin
+    if adjusted_distance <= _AOC_MAX_M:
+        return aoc_label, selected_bin
+    return fiber_label, selected_bin
+
+
+# Compiled policies for select_cable_type_and_bin, keyed by (id(policy), bins). Each entry holds a weak
+# reference to its policy so a recycled id is never mistaken for the original, and so dead entries go away.
+_COMPILED_POLICIES: Dict[Tuple[int, Tuple[int, ...]], Tuple[weakref.ref, CompiledPolicy]] = {}
+
+
+def _compiled_policy_for(policy: CablingPolicy, length_bins_m: Sequence[int]) -> CompiledPolicy:
+    key = (id(policy), tuple(length_bins_m))
+    entry = _COMPILED_POLICIES.get(key)
+    if entry is not None and entry[0]() is policy:
+        return entry[1]
+    compiled = compile_policy(policy, length_bins_m)
+    try:
+        ref = weakref.ref(policy, lambda _, key=key: _COMPILED_POLICIES.pop(key, None))
+    except TypeError:
+        return compiled  # not weak-referenceable; compile per call
+    _COMPILED_POLICIES[key] = (ref, compiled)
+    return compiled
 
-    return cable_type, selected_bin
 
+def select_cable_type_and_bin(
+    distance_m: float, link_type: str, policy: CablingPolicy, length_bins_m: List[int]
+) -> Tuple[str, int]:
+    """Select cable type and length bin based on distance and policy.
 
-def build_network_links(topology: NetworkTopology, site: SiteRec, policy: CablingPolicy) -> List[Dict[str, Any]]:
+    The policy is compiled once per (policy object, bins) and reused across calls, so treat it as
+    read-only once it has been passed here.
+    """
+    return _select_cable_type_and_bin(distance_m, link_type, _compiled_policy_for(policy, length_bins_m))
+
+
+# Dict keys of the legacy link records that differ from the NetworkLink field names.
+_LINK_KEY_ALIASES = {"from": "src", "to": "dst"}
+
+
+@dataclass(slots=True)
+class NetworkLink:
+    """One cable run produced by `build_network_links`."""
+
+    src: str
+    dst: str
+    type: str
+    distance_m: float
+    cable_type: str
+    length_bin: int
+    category: str
+
+    def __getitem__(self, key: str) -> Any:
+        # Dict-style access for callers written against the old link dicts (``link["from"]`` etc.).
+        return getattr(self, _LINK_KEY_ALIASES.get(key, key))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The legacy link dict (``from``/``to`` keys), for consumers that need a real mapping."""
+        return {
+            "from": self.src,
+            "to": self.dst,
+            "type": self.type,
+            "distance_m": self.distance_m,
+            "cable_type": self.cable_type,
+            "length_bin": self.length_bin,
+            "category": self.category,
+        }
+
+
+def build_network_links(
+    topology: NetworkTopology,
+    site: SiteRec,
+    policy: CablingPolicy,
+    length_bins_m: Sequence[int] = _DEFAULT_LENGTH_BINS_M,
+) -> List[NetworkLink]:
     """Build network links with distances and cable types."""
-    # TODO: Add type annotation to  links
-    links = []
+    links: List[NetworkLink] = []
 
     # Build rack position lookup
     rack_positions = {}
@@ -128,9 +331,38 @@ def build_network_links(topology: NetworkTopology, site: SiteRec, policy: Cablin
     if topology and topology.spines is not None and len(topology.spines) > 0:
         spine_rack = topology.spines[0].rack_id
 
+    # Resolve policy lookups once for the whole run rather than per link
+    compiled = compile_policy(policy, length_bins_m)
+
     # Process spine to leaf connections
     spines = topology.spines
     leafs = topology.leafs
+    # Every spine-to-leaf link starts at the spine rack, so measure it against all placed racks in one batch
+    spine_rack_distance_m: Dict[str, float] = {}
+    if spine_rack and rack_positions.get(spine_rack) is not None:
+        spine_rack_distance_m = compute_rack_distances_m(
+            rack_positions[spine_rack],
+            {rack_id: grid for rack_id, grid in rack_positions.items() if grid is not None},
+            compiled.tile_m,
+        )
+    # Resolve each leaf's distance (including the policy/default fallbacks) once, before walking the
+    # interfaces; the per-link work is then a single lookup by leaf id.
+    leaf_distance_m: Dict[str, float] = {}
+    for leaf in leafs:
+        leaf_rack = leaf.rack_id
+        distance_m = spine_rack_distance_m.get(leaf_rack) if leaf_rack else None
+        if distance_m is None:
+            if site is None:
+                # Use heuristic distances from policy
+                if spine_rack == leaf_rack:
+                    distance_m = compiled.same_rack_leaf_to_node_m
+                else:
+                    distance_m = compiled.adjacent_rack_leaf_to_spine_m
+            else:
+                distance_m = 3.0  # Default fallback
+        leaf_distance_m[leaf.id] = distance_m
+    # Media/bin selection is pure in (distance, link type); links to racks at equal distance share it
+    selections: Dict[Tuple[float, str], Tuple[str, int]] = {}
     """
        We have one spine:
        
@@ -175,81 +407,56 @@ def build_network_links(topology: NetworkTopology, site: SiteRec, policy: Cablin
                 and interface.type is not None  # True: they always have a type in valid yaml
             ):
                 # Parse connection (e.g., "tor-west-1:qsfp28-1")
-                connection_parts = interface.connects_to.split(":")  # ['tor-west-1', 'qsfp28-1']
-                if len(connection_parts) == 2:
-                    leaf_id, leaf_port = connection_parts
-
-                    # Find the leaf
-                    leaf = next(
-                        filter(lambda x: x.id == leaf_id, leafs)
-                    )  # Switch(id='tor-west-1', model='Mellanox SN2410', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='qsfp28-1', type='100G', connects_to='spine-1:eth1/1'), Interface(name='qsfp28-2', type='100G', connects_to='spine-1:eth1/2')], rack_id='rack-1')
-                    if leaf:
-                        leaf_rack = leaf.rack_id  # rack-1
-
-                        # Calculate distance
-                        distance_m = 3.0  # Default fallback
-                        if (
-                            spine_rack and leaf_rack and spine_rack in rack_positions and leaf_rack in rack_positions
-                        ):  # True
-                            heuristics = (
-                                policy.heuristics
-                            )  # Heuristics(same_rack_leaf_to_node_m=2.0, adjacent_rack_leaf_to_spine_m=10.0, non_adjacent_rack_leaf_to_spine_m=30.0, slack_factor=1.2, tile_m=1.0)
-                            tile_m = heuristics.tile_m  # 1.0
-                            distance_m = calculate_manhattan_distance(
-                                rack_positions[spine_rack], rack_positions[leaf_rack], tile_m
-                            )
-                        elif site is None:
-                            # Use heuristic distances from policy
-                            heuristics = policy.heuristics
-                            if spine_rack == leaf_rack:
-                                distance_m = heuristics.same_rack_leaf_to_node_m
-                            else:
-                                distance_m = heuristics.adjacent_rack_leaf_to_spine_m
-
+                leaf_id, sep, leaf_port = interface.connects_to.partition(":")  # ('tor-west-1', ':', 'qsfp28-1')
+                if sep and leaf_port:
+                    # Find the leaf and its precomputed distance
+                    distance_m = leaf_distance_m.get(leaf_id)
+                    if distance_m is not None:
                         # Determine link type
                         link_type = interface.type  # 100G
 
                         # Select cable type and bin TODO: don't hard code the bin lengths here
-                        cable_type, length_bin = select_cable_type_and_bin(
-                            distance_m, link_type, policy, [1, 2, 3, 5, 7, 10]
-                        )
+                        selection = selections.get((distance_m, link_type))
+                        if selection is None:
+                            selection = selections[(distance_m, link_type)] = _select_cable_type_and_bin(
+                                distance_m, link_type, compiled
+                            )
+                        cable_type, length_bin = selection
 
                         links.append(
-                            {
-                                "from": f"{spine.id}:{interface.name}",
-                                "to": f"{leaf_id}:{leaf_port}",
-                                "type": link_type,
-                                "distance_m": distance_m,
-                                "cable_type": cable_type,
-                                "length_bin": length_bin,
-                                "category": "spine_to_leaf",
-                            }
+                            NetworkLink(
+                                src=f"{spine.id}:{interface.name}",
+                                dst=f"{leaf_id}:{leaf_port}",
+                                type=link_type,
+                                distance_m=distance_m,
+                                cable_type=cable_type,
+                                length_bin=length_bin,
+                                category="spine_to_leaf",
+                            )
                         )
 
-    # Add WAN connections if specified
-    # site is the wrong attribute to check for wan_handoff
-    # wan_handoff is not defined on any models
-    # spine: SiteRec(racks=[SiteRackRec(id='rack-1', grid=(0, 0), tor_position_u=42), SiteRackRec(id='rack-2', grid=(1, 0), tor_position_u=42), SiteRackRec(id='rack-3', grid=(0, 1), tor_position_u=42), SiteRackRec(id='rack-4', grid=(1, 1), tor_position_u=42)])
-    # might make sense to leave that under toplogy.yaml as an interface?
-    # NetworkTopology(spines=[Switch(id='spine-1', model='Mellanox SN2700', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='eth1/1', type='100G', connects_to='tor-west-1:qsfp28-1'), Interface(name='eth1/2', type='100G', connects_to='tor-east-1:qsfp28-1'), Interface(name='eth1/3', type='100G', connects_to='tor-north-1:qsfp28-1'), Interface(name='eth1/4', type='100G', connects_to='tor-crypt-1:qsfp28-1')], rack_id='rack-1')], leafs=[Switch(id='tor-west-1', model='Mellanox SN2410', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='qsfp28-1', type='100G', connects_to='spine-1:eth1/1'), Interface(name='qsfp28-2', type='100G', connects_to='spine-1:eth1/2')], rack_id='rack-1'), Switch(id='tor-east-1', model='Mellanox SN2410', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='qsfp28-1', type='100G', connects_to='spine-1:eth1/2'), Interface(name='qsfp28-2', type='100G', connects_to='spine-1:eth1/1')], rack_id='rack-2'), Switch(id='tor-north-1', model='Mellanox SN2410', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='qsfp28-1', type='100G', connects_to='spine-1:eth1/3')], rack_id='rack-3'), Switch(id='tor-crypt-1', model='Mellanox SN2410', nos='Cumulus Linux (SONiC compatible)', interfaces=[Interface(name='qsfp28-1', type='100G', connects_to='spine-1:eth1/4')], rack_id='rack-4')])
-
-    if site and "spine" in site and "wan_handoff" in site["spine"]:
-        wan_handoff = site["spine"]["wan_handoff"]
-        wan_count = wan_handoff.get("count", 2)
-        wan_type = wan_handoff.get("type", "RJ45")
-
-        for i in range(wan_count):
-            cable_type, length_bin = select_cable_type_and_bin(2.0, wan_type, policy, [1, 2, 3, 5, 7, 10])
-            links.append(
-                {
-                    "from": f"spine-wan-{i + 1}",
-                    "to": f"wan-router:{i + 1}",
-                    "type": wan_type,
-                    "distance_m": 2.0,
-                    "cable_type": cable_type,
-                    "length_bin": length_bin,
-                    "category": "wan",
-                }
-            )
+    # Add WAN connections if the site declares a handoff
+    wan_handoff = getattr(site, "wan_handoff", None) if site is not None else None
+    if wan_handoff:
+        wan_count = wan_handoff.count
+        wan_type = wan_handoff.type
+
+        # Every WAN link has the same length and type, so select its media once
+        cable_type, length_bin = _select_cable_type_and_bin(2.0, wan_type, compiled)
+        # The WAN count is exact, so grow the list once instead of appending per uplink
+        links.extend(
+            [
+                NetworkLink(
+                    src=f"spine-wan-{i + 1}",
+                    dst=f"wan-router:{i + 1}",
+                    type=wan_type,
+                    distance_m=2.0,
+                    cable_type=cable_type,
+                    length_bin=length_bin,
+                    category="wan",
+                )
+                for i in range(wan_count)
+            ]
+        )
 
     return links
@@ -5,10 +5,11 @@ This module provides functionality to reconcile calculated BOM against declared
 mismatches in media/length bins.
 """
 
+from bisect import bisect_left
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
-import yaml
 from inferno_core.data.network_loader import (
     load_nodes,
     load_site,
@@ -17,12 +18,24 @@ from inferno_core.data.network_loader import (
 )
 from inferno_core.models.cross import CrossFinding, CrossReport
 from inferno_core.data.cabling_policy import load_cabling_policy
+from inferno_core.data.loader import _read_yaml_raw
+from inferno_tools.cabling.common import (
+    _DEFAULT_LENGTH_BINS_M,
+    apply_slack,
+    compute_rack_distances_m,
+    precompute_bins,
+    select_length_bin_sorted,
+    select_length_bins_many,
+)
 
 
 def _load_bom_yaml(bom_path: Path | str) -> Dict[str, Any]:
-    """Load BOM from YAML file."""
-    with open(bom_path, "r") as f:
-        data = yaml.safe_load(f)
+    """Load BOM from YAML file.
+
+    Parsing goes through the shared reader, so repeat loads of an unchanged file reuse the
+    cached document; the result is treated as read-only.
+    """
+    data = _read_yaml_raw(bom_path)
 
     # Handle both old format (direct bom dict) and new format (with items/meta)
     if "items" in data or "meta" in data:
@@ -53,30 +66,36 @@ def _infer_class_from_cable_type(cable_type: str, quantity: int) -> str:
         return "unknown"
 
 
+def _nest_class_counts(counts: Counter) -> Dict[str, Dict[str, Dict[int, int]]]:
+    """Reshape flat ``(class, cable_type, length_bin) -> count`` tallies into the nested class structure."""
+    result: Dict[str, Dict[str, Dict[int, int]]] = {}
+    for (class_name, cable_type, length_bin), count in counts.items():
+        result.setdefault(class_name, {}).setdefault(cable_type, {})[length_bin] = count
+    return result
+
+
+def _flatten_class_counts(structure: Dict[str, Dict[str, Dict[int, int]]]) -> Counter:
+    """Inverse of `_nest_class_counts`: flatten the class structure to ``(class, cable_type, bin) -> count``."""
+    return Counter(
+        {
+            (class_name, cable_type, length_bin): count
+            for class_name, cable_types in structure.items()
+            for cable_type, bins in cable_types.items()
+            for length_bin, count in bins.items()
+        }
+    )
+
+
 def _normalize_bom_to_class_structure(bom_data: Dict[str, Any]) -> Dict[str, Dict[str, Dict[int, int]]]:
     """Convert BOM to class -> cable_type -> length_bin -> count structure."""
     items = bom_data.get("items", [])
 
-    result = {}
+    counts: Counter = Counter()
 
     if items:
-        # New format with explicit class
+        # New format with explicit class; multiple items with the same class/type/bin add up
         for item in items:
-            class_name = item["class"]
-            cable_type = item["cable_type"]
-            length_bin = item["length_bin_m"]
-            quantity = item["quantity"]
-
-            if class_name not in result:
-                result[class_name] = {}
-            if cable_type not in result[class_name]:
-                result[class_name][cable_type] = {}
-
-            # Handle case where we have multiple items with same class/type/bin
-            if length_bin in result[class_name][cable_type]:
-                result[class_name][cable_type][length_bin] += quantity
-            else:
-                result[class_name][cable_type][length_bin] = quantity
+            counts[(item["class"], item["cable_type"], item["length_bin_m"])] += item["quantity"]
     else:
         # Old format - infer class from cable_type
         # In this case, bom_data itself is the BOM structure
@@ -96,33 +115,28 @@ def _normalize_bom_to_class_structure(bom_data: Dict[str, Any]) -> Dict[str, Dic
                             continue
 
                         class_name = _infer_class_from_cable_type(cable_type, quantity)
+                        counts[(class_name, cable_type, length_bin_int)] = quantity
 
-                        if class_name not in result:
-                            result[class_name] = {}
-                        if cable_type not in result[class_name]:
-                            result[class_name][cable_type] = {}
-
-                        result[class_name][cable_type][length_bin_int] = quantity
-
-    return result
-
+    return _nest_class_counts(counts)
 
-def _calculate_manhattan_distance(rack1_grid: List[int], rack2_grid: List[int], tile_m: float = 1.0) -> float:
-    """Calculate Manhattan distance between two rack positions."""
-    return abs(rack1_grid[0] - rack2_grid[0]) * tile_m + abs(rack1_grid[1] - rack2_grid[1]) * tile_m
 
+def _select_length_bin(distance_m: float, sorted_bins: Tuple[int, ...]) -> int:
+    """Select the smallest bin that can accommodate the distance.
 
-def _select_length_bin(distance_m: float, bins: List[int]) -> int:
-    """Select the smallest bin that can accommodate the distance."""
-    for bin_size in sorted(bins):
-        if distance_m <= bin_size:
-            return bin_size
+    ``sorted_bins`` must come from `precompute_bins`; the lookup is a bisect with no re-sorting.
+    """
+    selected = select_length_bin_sorted(distance_m, sorted_bins)
+    if selected is not None:
+        return selected
     # If no bin is large enough, return the largest bin
-    return max(bins)
+    return sorted_bins[-1]
 
 
 def _derive_intent_links(topology, tors, nodes, site, policy) -> List[Dict[str, Any]]:
-    """Derive expected links from topology, nodes, and policy."""
+    """Derive expected links from topology, nodes, and policy.
+
+    Every link is its own dict, so callers may annotate individual links freely.
+    """
     links = []
 
     # Get policy defaults
@@ -137,14 +151,25 @@ def _derive_intent_links(topology, tors, nodes, site, policy) -> List[Dict[str,
     slack_factor = defaults.get("slack_factor", 1.2)
     tile_m = heuristics.get("tile_m", 1.0)
 
+    # Resolve and sort the per-media bins once rather than inside the node/rack loops
+    sfp28_bins = precompute_bins(media_rules.get("sfp28_25g", {}).get("bins_m", _DEFAULT_LENGTH_BINS_M))
+    qsfp28_bins = precompute_bins(media_rules.get("qsfp28_100g", {}).get("bins_m", _DEFAULT_LENGTH_BINS_M))
+    rj45_bins = precompute_bins(media_rules.get("rj45_cat6a", {}).get("bins_m", _DEFAULT_LENGTH_BINS_M))
+
     # Build rack position lookup if site data available
     rack_positions = {}
     if site and "racks" in site:
         for rack in site["racks"]:
             rack_positions[rack["id"]] = rack.get("grid", [0, 0])
 
+    node_list = nodes.get("nodes", [])
+    if node_list:
+        # Leaf-node and mgmt runs have a fixed length, so every node gets the same bins
+        leaf_node_bin = _select_length_bin(same_rack_distance * slack_factor, sfp28_bins)
+        mgmt_bin = _select_length_bin(5.0 * slack_factor, rj45_bins)
+
     # 1. Leaf-node links (SFP28)
-    for node in nodes.get("nodes", []):
+    for node in node_list:
         rack_id = node["rack_id"]
 
         # Get NIC count from node declaration or policy default
@@ -153,77 +178,51 @@ def _derive_intent_links(topology, tors, nodes, site, policy) -> List[Dict[str,
         if sfp28_count == 0:
             sfp28_count = nodes_25g_per_node
 
-        # Calculate distance (same rack)
-        distance = same_rack_distance * slack_factor
-
-        # Select media and bin
-        sfp28_rules = media_rules.get("sfp28_25g", {})
-        sfp28_rules.get("dac_max_m", 3.0)
-        bins = sfp28_rules.get("bins_m", [1, 2, 3, 5, 7, 10])
-
-        length_bin = _select_length_bin(distance, bins)
-
-        for _ in range(sfp28_count):
-            links.append(
-                {
-                    "class": "leaf-node",
-                    "cable_type": "sfp28_25g",
-                    "length_bin_m": length_bin,
-                    "rack_id": rack_id,
-                    "node_id": node["id"],
-                }
-            )
+        link = {
+            "class": "leaf-node",
+            "cable_type": "sfp28_25g",
+            "length_bin_m": leaf_node_bin,
+            "rack_id": rack_id,
+            "node_id": node["id"],
+        }
+        links.extend(link.copy() for _ in range(sfp28_count))
 
     # 2. Leaf-spine links (QSFP28)
-    for rack in topology.get("racks", []):
+    # Measure every placed rack from the spine in one pass instead of once per rack
+    spine_distances: Dict[str, float] = {}
+    if "spine" in rack_positions:
+        placed = {rid: grid for rid, grid in rack_positions.items() if grid is not None}
+        spine_distances = compute_rack_distances_m(rack_positions["spine"] or [0, 0], placed, tile_m)
+    topo_racks = topology.get("racks", [])
+    # Distance to spine, falling back to the adjacent-rack heuristic for unplaced racks
+    uplink_distances = [
+        apply_slack(spine_distances.get(rack["rack_id"], adjacent_rack_distance), slack_factor) for rack in topo_racks
+    ]
+    # Bin the whole column at once; runs longer than every bin take the largest one
+    uplink_bins = select_length_bins_many(uplink_distances, qsfp28_bins)
+    for rack, length_bin in zip(topo_racks, uplink_bins):
         rack_id = rack["rack_id"]
         uplinks = rack.get("uplinks_qsfp28", defaults.get("tor_uplink_qsfp28_per_tor", 2))
+        bin_m = qsfp28_bins[-1] if length_bin is None else length_bin
 
-        # Calculate distance to spine
-        if rack_id in rack_positions and "spine" in rack_positions:
-            spine_pos = rack_positions.get("spine", [0, 0])
-            rack_pos = rack_positions[rack_id]
-            distance = _calculate_manhattan_distance(rack_pos, spine_pos, tile_m) * slack_factor
-        else:
-            distance = adjacent_rack_distance * slack_factor
-
-        # Select media and bin
-        qsfp28_rules = media_rules.get("qsfp28_100g", {})
-        qsfp28_rules.get("dac_max_m", 3.0)
-        bins = qsfp28_rules.get("bins_m", [1, 2, 3, 5, 7, 10])
-
-        length_bin = _select_length_bin(distance, bins)
+        link = {"class": "leaf-spine", "cable_type": "qsfp28_100g", "length_bin_m": bin_m, "rack_id": rack_id}
+        links.extend(link.copy() for _ in range(uplinks))
 
-        for _ in range(uplinks):
-            links.append(
-                {"class": "leaf-spine", "cable_type": "qsfp28_100g", "length_bin_m": length_bin, "rack_id": rack_id}
-            )
-
-    # 3. Management links (RJ45)
-    for node in nodes.get("nodes", []):
+    # 3. Management links (RJ45), at the default mgmt distance
+    for node in node_list:
         rack_id = node["rack_id"]
 
         # Get mgmt port count
         mgmt_count = mgmt_rj45_per_node
 
-        # Use default distance for mgmt
-        distance = 5.0 * slack_factor
-
-        # Select bin
-        rj45_rules = media_rules.get("rj45_cat6a", {})
-        bins = rj45_rules.get("bins_m", [1, 2, 3, 5, 7, 10])
-        length_bin = _select_length_bin(distance, bins)
-
-        for _ in range(mgmt_count):
-            links.append(
-                {
-                    "class": "mgmt",
-                    "cable_type": "rj45_cat6a",
-                    "length_bin_m": length_bin,
-                    "rack_id": rack_id,
-                    "node_id": node["id"],
-                }
-            )
+        link = {
+            "class": "mgmt",
+            "cable_type": "rj45_cat6a",
+            "length_bin_m": mgmt_bin,
+            "rack_id": rack_id,
+            "node_id": node["id"],
+        }
+        links.extend(link.copy() for _ in range(mgmt_count))
 
     # 4. WAN links
     wan_config = topology.get("wan", {})
@@ -234,35 +233,31 @@ def _derive_intent_links(topology, tors, nodes, site, policy) -> List[Dict[str,
         distance = 10.0 * slack_factor
 
         # Select bin
-        rj45_rules = media_rules.get("rj45_cat6a", {})
-        bins = rj45_rules.get("bins_m", [1, 2, 3, 5, 7, 10])
-        length_bin = _select_length_bin(distance, bins)
+        length_bin = _select_length_bin(distance, rj45_bins)
 
-        for _ in range(wan_uplinks):
-            links.append({"class": "wan", "cable_type": "rj45_cat6a", "length_bin_m": length_bin})
+        links.extend(
+            {"class": "wan", "cable_type": "rj45_cat6a", "length_bin_m": length_bin} for _ in range(wan_uplinks)
+        )
 
     return links
 
 
 def _aggregate_intent_to_class_structure(links: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[int, int]]]:
     """Aggregate intent links into class -> cable_type -> length_bin -> count structure."""
-    result = {}
-
-    for link in links:
-        class_name = link["class"]
-        cable_type = link["cable_type"]
-        length_bin = link["length_bin_m"]
-
-        if class_name not in result:
-            result[class_name] = {}
-        if cable_type not in result[class_name]:
-            result[class_name][cable_type] = {}
-        if length_bin not in result[class_name][cable_type]:
-            result[class_name][cable_type][length_bin] = 0
-
-        result[class_name][cable_type][length_bin] += 1
-
-    return result
+    counts = Counter((link["class"], link["cable_type"], link["length_bin_m"]) for link in links)
+    return _nest_class_counts(counts)
+
+
+def _reconcile_finding(
+    severity: str, code: str, message: str, class_name: str, cable_type: str, **context: Any
+) -> CrossFinding:
+    """Build a reconciliation finding whose context is keyed by class and cable type."""
+    return CrossFinding(
+        severity=severity,
+        code=code,
+        message=message,
+        context={"class": class_name, "cable_type": cable_type, **context},
+    )
 
 
 def _reconcile_bom_vs_intent(
@@ -276,133 +271,107 @@ def _reconcile_bom_vs_intent(
     # Get policy settings
     bin_slop_m = policy.get("heuristics", {}).get("bin_slop_m", 2.0)
 
-    # Track what we've already reconciled to avoid duplicate findings
-    reconciled_bom = {}
-    reconciled_intent = {}
-
-    # Initialize tracking structures
-    for class_name in set(list(bom_structure.keys()) + list(intent_structure.keys())):
-        reconciled_bom[class_name] = {}
-        reconciled_intent[class_name] = {}
-
-        bom_cable_types = bom_structure.get(class_name, {})
-        intent_cable_types = intent_structure.get(class_name, {})
-
-        for cable_type in set(list(bom_cable_types.keys()) + list(intent_cable_types.keys())):
-            reconciled_bom[class_name][cable_type] = {}
-            reconciled_intent[class_name][cable_type] = {}
-
-            # Copy original counts
-            for bin_size, count in bom_cable_types.get(cable_type, {}).items():
-                reconciled_bom[class_name][cable_type][bin_size] = count
-            for bin_size, count in intent_cable_types.get(cable_type, {}).items():
-                reconciled_intent[class_name][cable_type][bin_size] = count
-
-    # First pass: Handle exact matches and bin mismatches
-    for class_name in reconciled_bom:
-        for cable_type in reconciled_bom[class_name]:
-            bom_bins = list(reconciled_bom[class_name][cable_type].keys())
-            intent_bins = list(reconciled_intent[class_name][cable_type].keys())
-
-            # Handle exact matches first
-            for bin_size in list(bom_bins):
-                if bin_size in intent_bins:
-                    bom_count = reconciled_bom[class_name][cable_type][bin_size]
-                    intent_count = reconciled_intent[class_name][cable_type][bin_size]
-
-                    # Match what we can
-                    matched = min(bom_count, intent_count)
-                    reconciled_bom[class_name][cable_type][bin_size] -= matched
-                    reconciled_intent[class_name][cable_type][bin_size] -= matched
-
-                    # Remove zero entries
-                    if reconciled_bom[class_name][cable_type][bin_size] == 0:
-                        del reconciled_bom[class_name][cable_type][bin_size]
-                    if reconciled_intent[class_name][cable_type][bin_size] == 0:
-                        del reconciled_intent[class_name][cable_type][bin_size]
-
-            # Handle bin mismatches for remaining items
-            remaining_bom_bins = list(reconciled_bom[class_name][cable_type].keys())
-            remaining_intent_bins = list(reconciled_intent[class_name][cable_type].keys())
-
-            for bom_bin in remaining_bom_bins:
-                if remaining_intent_bins:
-                    # Find closest intent bin
-                    closest_intent_bin = min(remaining_intent_bins, key=lambda x: abs(x - bom_bin))
-
-                    bom_count = reconciled_bom[class_name][cable_type][bom_bin]
-                    intent_count = reconciled_intent[class_name][cable_type][closest_intent_bin]
-
-                    # Check if this is a valid bin mismatch (same quantities)
-                    if bom_count == intent_count:
-                        # This is a bin mismatch
-                        if bom_bin >= closest_intent_bin and (bom_bin - closest_intent_bin) <= bin_slop_m:
-                            severity = "WARN"
-                            code = "BIN_MISMATCH_WARN"
-                        else:
-                            severity = "FAIL"
-                            code = "BIN_MISMATCH_FAIL"
-
-                        findings.append(
-                            CrossFinding(
-                                severity=severity,
-                                code=code,
-                                message=f"{class_name} {cable_type}:"
-                                f" BOM uses {bom_bin}m bin, intent expects {closest_intent_bin}m",
-                                context={
-                                    "class": class_name,
-                                    "cable_type": cable_type,
-                                    "bom_bin_m": bom_bin,
-                                    "intent_bin_m": closest_intent_bin,
-                                    "bin_slop_m": bin_slop_m,
-                                },
-                            )
-                        )
-
-                        # Remove these from further processing
-                        del reconciled_bom[class_name][cable_type][bom_bin]
-                        del reconciled_intent[class_name][cable_type][closest_intent_bin]
+    # A class whose counts agree on both sides yields no findings, so only differing classes are reconciled
+    matching = {name for name, types in bom_structure.items() if intent_structure.get(name) == types}
+    if matching:
+        bom_structure = {name: types for name, types in bom_structure.items() if name not in matching}
+        intent_structure = {name: types for name, types in intent_structure.items() if name not in matching}
+        if not bom_structure and not intent_structure:
+            return findings
+
+    # Flatten both sides to (class, cable_type, bin) -> count and cancel exact matches in one step;
+    # what is left on each side is the unreconciled remainder
+    remaining_bom = _flatten_class_counts(bom_structure)
+    remaining_intent = _flatten_class_counts(intent_structure)
+    matched = remaining_bom & remaining_intent
+    remaining_bom -= matched
+    remaining_intent -= matched
+
+    # Remaining intent bins per (class, cable_type), sorted so the closest one can be bisected
+    intent_order = {key: n for n, key in enumerate(remaining_intent)}
+    intent_bins: Dict[Tuple[str, str], List[int]] = {}
+    for class_name, cable_type, length_bin in remaining_intent:
+        intent_bins.setdefault((class_name, cable_type), []).append(length_bin)
+    for bins in intent_bins.values():
+        bins.sort()
+
+    # Bin mismatches: a leftover BOM bin whose closest leftover intent bin has the same quantity
+    for (class_name, cable_type, bom_bin), bom_count in list(remaining_bom.items()):
+        candidates = intent_bins.get((class_name, cable_type))
+        if not candidates:
+            continue
+
+        # Closest intent bin; on a tie the one declared first wins
+        i = bisect_left(candidates, bom_bin)
+        if i == len(candidates):
+            i -= 1
+        elif i > 0:
+            below, above = bom_bin - candidates[i - 1], candidates[i] - bom_bin
+            if below < above or (
+                below == above
+                and intent_order[(class_name, cable_type, candidates[i - 1])]
+                < intent_order[(class_name, cable_type, candidates[i])]
+            ):
+                i -= 1
+        closest_intent_bin = candidates[i]
+
+        # Check if this is a valid bin mismatch (same quantities)
+        if remaining_intent[(class_name, cable_type, closest_intent_bin)] != bom_count:
+            continue
+
+        if bom_bin >= closest_intent_bin and (bom_bin - closest_intent_bin) <= bin_slop_m:
+            severity = "WARN"
+            code = "BIN_MISMATCH_WARN"
+        else:
+            severity = "FAIL"
+            code = "BIN_MISMATCH_FAIL"
+
+        findings.append(
+            _reconcile_finding(
+                severity,
+                code,
+                f"{class_name} {cable_type}: BOM uses {bom_bin}m bin, intent expects {closest_intent_bin}m",
+                class_name,
+                cable_type,
+                bom_bin_m=bom_bin,
+                intent_bin_m=closest_intent_bin,
+                bin_slop_m=bin_slop_m,
+            )
+        )
+
+        # Remove these from further processing
+        del remaining_bom[(class_name, cable_type, bom_bin)]
+        del remaining_intent[(class_name, cable_type, closest_intent_bin)]
+        del candidates[i]
 
     # Second pass: Handle true missing and phantom items
-    for class_name in reconciled_intent:
-        for cable_type in reconciled_intent[class_name]:
-            for length_bin, required_count in reconciled_intent[class_name][cable_type].items():
-                if required_count > 0:
-                    findings.append(
-                        CrossFinding(
-                            severity="FAIL",
-                            code="MISSING_LINK",
-                            message=f"{class_name} requires {required_count} × {cable_type} @ {length_bin} m;"
-                            f" BOM provides 0",
-                            context={
-                                "class": class_name,
-                                "cable_type": cable_type,
-                                "length_bin_m": length_bin,
-                                "required": required_count,
-                                "provided": 0,
-                            },
-                        )
-                    )
-
-    for class_name in reconciled_bom:
-        for cable_type in reconciled_bom[class_name]:
-            for length_bin, provided_count in reconciled_bom[class_name][cable_type].items():
-                if provided_count > 0:
-                    findings.append(
-                        CrossFinding(
-                            severity="WARN",
-                            code="PHANTOM_ITEM",
-                            message=f"{class_name} BOM has {provided_count} × {cable_type} @ {length_bin} m;"
-                            f" intent requires 0",
-                            context={
-                                "class": class_name,
-                                "cable_type": cable_type,
-                                "length_bin_m": length_bin,
-                                "required": 0,
-                                "provided": provided_count,
-                            },
-                        )
-                    )
+    for (class_name, cable_type, length_bin), required_count in remaining_intent.items():
+        findings.append(
+            _reconcile_finding(
+                "FAIL",
+                "MISSING_LINK",
+                f"{class_name} requires {required_count} × {cable_type} @ {length_bin} m; BOM provides 0",
+                class_name,
+                cable_type,
+                length_bin_m=length_bin,
+                required=required_count,
+                provided=0,
+            )
+        )
+
+    for (class_name, cable_type, length_bin), provided_count in remaining_bom.items():
+        findings.append(
+            _reconcile_finding(
+                "WARN",
+                "PHANTOM_ITEM",
+                f"{class_name} BOM has {provided_count} × {cable_type} @ {length_bin} m; intent requires 0",
+                class_name,
+                cable_type,
+                length_bin_m=length_bin,
+                required=0,
+                provided=provided_count,
+            )
+        )
 
     return findings
 
@@ -464,13 +433,14 @@ def cross_validate_bom(
     # Reconcile and generate findings
     findings = _reconcile_bom_vs_intent(bom_structure, intent_structure, policy)
 
-    # Generate summary
+    # Generate summary from a single pass over the findings
+    code_counts = Counter(f.code for f in findings)
     summary = {
-        "missing": len([f for f in findings if f.code == "MISSING_LINK"]),
-        "phantom": len([f for f in findings if f.code == "PHANTOM_ITEM"]),
-        "mismatched_media": len([f for f in findings if f.code == "MEDIA_MISMATCH"]),
-        "mismatched_bin": len([f for f in findings if f.code.startswith("BIN_MISMATCH")]),
-        "count_mismatch": len([f for f in findings if f.code == "COUNT_MISMATCH"]),
+        "missing": code_counts["MISSING_LINK"],
+        "phantom": code_counts["PHANTOM_ITEM"],
+        "mismatched_media": code_counts["MEDIA_MISMATCH"],
+        "mismatched_bin": sum(n for code, n in code_counts.items() if code.startswith("BIN_MISMATCH")),
+        "count_mismatch": code_counts["COUNT_MISMATCH"],
     }
 
     # Generate mapping stats
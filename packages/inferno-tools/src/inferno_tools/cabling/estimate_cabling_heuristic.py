@@ -3,10 +3,20 @@ from typing import Optional, List
 from inferno_core.data.cabling_policy import load_cabling_policy
 from inferno_tools.cabling import with_spares
 from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
 
 console = Console()
 
 
+def _pick_int(*sources: object, default: int) -> int:
+    """Return the first source that is set, as an int, else `default`; only the winner is coerced."""
+    for source in sources:
+        if source is not None:
+            return int(source)
+    return default
+
+
 def estimate_cabling_heuristic(
     *,
     policy_path: str = "doctrine/network/cabling-policy.yaml",
@@ -27,24 +37,27 @@ def estimate_cabling_heuristic(
     if length_bins_m is None:
         length_bins_m = [1, 2, 3, 5, 7, 10]
 
-    # Load policy and override planning knobs for counts
+    # Load policy and override planning knobs for counts. Only keys set in the policy file
+    # override the knobs, so dump the typed sections without their model defaults.
     policy = load_cabling_policy(policy_path)
-    p_def = policy.get("defaults", {})
-    p_bins = policy.get("bins", {})
+    p_def = policy.defaults.model_dump(exclude_unset=True)
+    p_bins = policy.bins
 
-    p_site = policy.get("site_defaults", {})
+    p_site = policy.site_defaults.model_dump(exclude_unset=True)
 
-    num_racks_eff = int(p_site.get("num_racks", num_racks))
-    nodes_per_rack_eff = int(p_site.get("nodes_per_rack", nodes_per_rack))
-    uplinks_per_rack_eff = int(p_site.get("uplinks_per_rack", uplinks_per_rack))
-    mgmt_rj45_per_node_eff_site = int(p_site.get("mgmt_rj45_per_node", mgmt_rj45_per_node))
-    wan_cat6a_eff_site = int(p_site.get("wan_cat6a", wan_cat6a))
+    num_racks_eff = _pick_int(p_site.get("num_racks"), default=num_racks)
+    nodes_per_rack_eff = _pick_int(p_site.get("nodes_per_rack"), default=nodes_per_rack)
 
-    nodes_25g_per_node_eff = int(p_def.get("nodes_25g_per_node", 1))
-    mgmt_rj45_per_node_eff = int(p_def.get("mgmt_rj45_per_node", mgmt_rj45_per_node_eff_site))
-    wan_cat6a_eff = int(p_def.get("wan_cat6a_count", wan_cat6a_eff_site))
-    uplinks_per_rack_eff = int(p_def.get("tor_uplink_qsfp28_per_tor", uplinks_per_rack_eff))
-    spares_fraction_eff = float(p_def.get("spares_fraction", spares_fraction))
+    nodes_25g_per_node_eff = _pick_int(p_def.get("nodes_25g_per_node"), default=1)
+    mgmt_rj45_per_node_eff = _pick_int(
+        p_def.get("mgmt_rj45_per_node"), p_site.get("mgmt_rj45_per_node"), default=mgmt_rj45_per_node
+    )
+    wan_cat6a_eff = _pick_int(p_def.get("wan_cat6a_count"), p_site.get("wan_cat6a"), default=wan_cat6a)
+    uplinks_per_rack_eff = _pick_int(
+        p_def.get("tor_uplink_qsfp28_per_tor"), p_site.get("uplinks_per_rack"), default=uplinks_per_rack
+    )
+    raw_spares = p_def.get("spares_fraction")
+    spares_fraction_eff = float(raw_spares) if raw_spares is not None else spares_fraction
 
     # Use policy bins for display
     sfp28_bins = p_bins.get("sfp28", length_bins_m)
@@ -63,50 +76,25 @@ def estimate_cabling_heuristic(
     total_mgmt_sp = with_spares(total_mgmt, spares_fraction_eff)
     total_wan_sp = with_spares(total_wan, spares_fraction_eff)
 
-    console.print("\n[bold cyan]Inferno Cabling Estimator (heuristic)[/bold cyan]\n")
-    console.print(
-        f"[yellow]"
-        f"Leaf → Node (SFP28 25G):"
-        f"[/yellow]"
-        f" {total_leaf_to_node}  "
-        f"[dim]"
-        f"(with spares: {total_leaf_to_node_sp})"
-        f"[/dim]"
-    )
-    console.print(
-        f"[yellow]"
-        f"Leaf → Spine (QSFP28 100G):"
-        f"[/yellow]"
-        f" {total_leaf_to_spine} "
-        f"[dim]"
-        f"(with spares: {total_leaf_to_spine_sp})"
-        f"[/dim]"
-    )
-    console.print(f"[yellow]Mgmt (RJ45 Cat6A):[/yellow] {total_mgmt}  [dim](with spares: {total_mgmt_sp})[/dim]")
-    console.print(f"[yellow]WAN (RJ45 Cat6A):[/yellow] {total_wan}  [dim](with spares: {total_wan_sp})[/dim]")
-
-    console.print(
-        "\n"
-        "[dim]"
-        "Policy:"
-        "[/dim]"
-        " {p}\n"
-        "[dim]Bins — SFP28:[/dim]"
-        " {b1}  "
-        "[dim]QSFP28:[/dim]"
-        " {b2}  "
-        "[dim]RJ45:[/dim]"
-        " {b3}\n".format(
-            p=policy_path,
-            b1=",".join(map(str, sfp28_bins)),
-            b2=",".join(map(str, qsfp28_bins)),
-            b3=",".join(map(str, rj45_bins)),
-        )
-    )
-    console.print(
-        f"[dim]"
-        f"Assumes {num_racks_eff} racks × {nodes_per_rack_eff} nodes per rack;"
+    table = Table(title="Inferno Cabling Estimator (heuristic)", title_style="bold cyan")
+    table.add_column("Class", style="yellow")
+    table.add_column("Count", justify="right")
+    table.add_column("With spares", justify="right", style="dim")
+    table.add_row("Leaf → Node (SFP28 25G)", str(total_leaf_to_node), str(total_leaf_to_node_sp))
+    table.add_row("Leaf → Spine (QSFP28 100G)", str(total_leaf_to_spine), str(total_leaf_to_spine_sp))
+    table.add_row("Mgmt (RJ45 Cat6A)", str(total_mgmt), str(total_mgmt_sp))
+    table.add_row("WAN (RJ45 Cat6A)", str(total_wan), str(total_wan_sp))
+
+    summary = Panel(
+        f"[dim]Policy:[/dim] {policy_path}\n"
+        f"[dim]Bins — SFP28:[/dim] {','.join(map(str, sfp28_bins))}"
+        f"  [dim]QSFP28:[/dim] {','.join(map(str, qsfp28_bins))}"
+        f"  [dim]RJ45:[/dim] {','.join(map(str, rj45_bins))}\n"
+        f"[dim]Assumes {num_racks_eff} racks × {nodes_per_rack_eff} nodes per rack;"
         f" {uplinks_per_rack_eff} QSFP28 uplinks per ToR; {mgmt_rj45_per_node_eff} RJ45 mgmt per node;"
-        f" {wan_cat6a_eff} WAN trunks (from policy/site-defaults)."
-        f"[/dim]\n"
+        f" {wan_cat6a_eff} WAN trunks (from policy/site-defaults).[/dim]",
+        expand=False,
     )
+
+    # One print call: Rich lays out both renderables and writes to the terminal once.
+    console.print(table, summary)
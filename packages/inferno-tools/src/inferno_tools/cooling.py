@@ -2,7 +2,9 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 
 import yaml
+from inferno_core.data.loader import SafeLoader
 from inferno_core.data.power import load_feeds
+from inferno_core.models.power import PowerFeed
 from rich.console import Console
 
 console = Console()
@@ -34,6 +36,20 @@ def btu_per_hr_to_tons(btu_hr: float) -> float:
     return btu_hr / 12000.0
 
 
+def _format_cooling_footnote(headroom: float) -> str:
+    """Footnote describing the by-circuit and by-load assumptions for a given headroom."""
+    if headroom == 1.0:
+        circuit_note = load_note = ""
+    else:
+        pct = f"{(headroom - 1) * 100:+.0f}%"
+        circuit_note = f", {pct} headroom"
+        load_note = f" ({pct} headroom)"
+    return (
+        f"Note: by-circuit = 240V/30A @ 80% load, 92% UPS eff.{circuit_note}.\n"
+        f"      by-load = modeled rack watts from doctrine/power/rack-power-budget.yaml{load_note}."
+    )
+
+
 # ----------------------------
 # Public API
 # ----------------------------
@@ -46,45 +62,40 @@ def estimate_cooling_by_circuit(
     voltage: float = DEFAULT_VOLTAGE,
     amperage: float = DEFAULT_AMPERAGE,
     continuous_factor: float = CONTINUOUS_LOAD_FACTOR,
+    feeds: List[PowerFeed] | None = None,
 ) -> None:
-    """Estimate cooling per rack and site total using branch circuit capacity assumptions."""
-    feeds = load_feeds()
+    """Estimate cooling per rack and site total using branch circuit capacity assumptions.
+
+    ``feeds`` lets a caller that has already loaded them (e.g. the by-load fallback) skip reloading.
+    """
+    if feeds is None:
+        feeds = load_feeds()
 
-    results: List[Tuple[str, float, float]] = []  # (label, BTU/hr, tons)
+    # Every feed is sized from the same circuit assumptions, so the load is computed once
+    # 80% continuous load rule
+    continuous_kw = voltage * amperage * continuous_factor / 1000.0
+    # Account for UPS inefficiency (source watts actually drawn to supply that load)
+    actual_kw = continuous_kw / ups_efficiency
+    btu_hr = watts_to_btu_per_hr(actual_kw * 1000.0) * headroom
+    tons = btu_per_hr_to_tons(btu_hr)
 
-    for feed in feeds:
-        # 80% continuous load rule
-        continuous_kw = voltage * amperage * continuous_factor / 1000.0
-        # Account for UPS inefficiency (source watts actually drawn to supply that load)
-        actual_kw = continuous_kw / ups_efficiency
-        btu_hr = watts_to_btu_per_hr(actual_kw * 1000.0) * headroom
-        results.append((feed.id, btu_hr, btu_per_hr_to_tons(btu_hr)))
+    results: List[Tuple[str, float, float]] = [(feed.id, btu_hr, tons) for feed in feeds]  # (label, BTU/hr, tons)
 
     total_btu = sum(b for _, b, _ in results)
     total_tons = sum(t for _, _, t in results)
 
-    console.print("\n[bold cyan]Inferno Cooling Estimator[/bold cyan]\n")
-    for rack_id, btu, tons in results:
-        console.print(
-            f"[green]{rack_id}[/green]: [yellow]{int(btu):,} BTU/hr[/yellow] → [magenta]{tons:.1f} tons[/magenta]"
-        )
-
-    console.print(
+    # Assemble the whole report and hand it to the console once rather than printing per rack
+    lines = ["\n[bold cyan]Inferno Cooling Estimator[/bold cyan]\n"]
+    lines.extend(
+        f"[green]{rack_id}[/green]: [yellow]{int(btu):,} BTU/hr[/yellow] → [magenta]{tons:.1f} tons[/magenta]"
+        for rack_id, btu, tons in results
+    )
+    lines.append(
         f"\n[bold]Total:[/bold] {int(total_btu):,} BTU/hr → [bold magenta]{total_tons:.1f} tons[/bold magenta]\n"
     )
 
-    if headroom == 1.0:
-        headroom_note = ""
-    else:
-        pct = (headroom - 1) * 100
-        headroom_note = f", {pct:+.0f}% headroom"
-    footnote = (
-        f"Note: by-circuit = 240V/30A @ 80% load, 92% UPS eff.{headroom_note}.\n"
-        f"      by-load = modeled rack watts from doctrine/power/rack-power-budget.yaml"
-        + (f" ({pct:+.0f}% headroom)" if headroom != 1.0 else "")
-        + "."
-    )
-    console.print(f"[dim]{footnote}[/dim]")
+    lines.append(f"[dim]{_format_cooling_footnote(headroom)}[/dim]")
+    console.print("\n".join(lines))
 
 
 def estimate_cooling_by_load(
@@ -97,22 +108,24 @@ def estimate_cooling_by_load(
     feeds = load_feeds()
 
     yaml_path = Path(budget_path) if isinstance(budget_path, str) else budget_path
-    if not yaml_path.exists():
+    # Open directly and treat FileNotFoundError as "missing" rather than stat-ing the path first.
+    try:
+        # Hand the loader the binary stream so it reads through its own buffer
+        with yaml_path.open("rb") as f:
+            data = yaml.load(f, Loader=SafeLoader) or {}
+    except FileNotFoundError:
         console.print(f"[yellow]Budget YAML not found at {yaml_path}; falling back to by-circuit.[/yellow]")
-        estimate_cooling_by_circuit()
+        estimate_cooling_by_circuit(feeds=feeds)
         return
-
-    try:
-        data = yaml.safe_load(yaml_path.read_text(encoding="utf-8")) or {}
     except Exception as e:
         console.print(f"[yellow]Error reading {yaml_path}: {e}; falling back to by-circuit.[/yellow]")
-        estimate_cooling_by_circuit()
+        estimate_cooling_by_circuit(feeds=feeds)
         return
 
     racks = data.get("racks", [])
     if not isinstance(racks, list) or not racks:
         console.print(f"[yellow]No racks found in {yaml_path}; falling back to by-circuit.[/yellow]")
-        estimate_cooling_by_circuit()
+        estimate_cooling_by_circuit(feeds=feeds)
         return
 
     # Map feed_id -> modeled watts
@@ -120,45 +133,34 @@ def estimate_cooling_by_load(
     for r in racks:
         feed_id = r.get("feed_id")
         watts = r.get("estimated_draw_w")
-        if isinstance(feed_id, str) and isinstance(watts, int | float):
+        if isinstance(feed_id, str) and isinstance(watts, (int, float)):
             loads[feed_id] = float(watts)
 
     if not loads:
         console.print(f"[yellow]No per-rack loads present in {yaml_path}; falling back to by-circuit.[/yellow]")
-        estimate_cooling_by_circuit()
+        estimate_cooling_by_circuit(feeds=feeds)
         return
 
     results: List[Tuple[str, float, float]] = []
     for feed in feeds:
-        watts = float(loads.get(feed.id, 0.0))
-        btu_hr = watts_to_btu_per_hr(watts) * headroom
+        btu_hr = watts_to_btu_per_hr(loads.get(feed.id, 0.0)) * headroom
         results.append((feed.id, btu_hr, btu_per_hr_to_tons(btu_hr)))
 
     total_btu = sum(b for _, b, _ in results)
     total_tons = sum(t for _, _, t in results)
 
-    console.print("\n[bold cyan]Inferno Cooling Estimator[/bold cyan]\n")
-    for rack_id, btu, tons in results:
-        console.print(
-            f"[green]{rack_id}[/green]: [yellow]{int(btu):,} BTU/hr[/yellow] → [magenta]{tons:.1f} tons[/magenta]"
-        )
-
-    console.print(
+    # Assemble the whole report and hand it to the console once rather than printing per rack
+    lines = ["\n[bold cyan]Inferno Cooling Estimator[/bold cyan]\n"]
+    lines.extend(
+        f"[green]{rack_id}[/green]: [yellow]{int(btu):,} BTU/hr[/yellow] → [magenta]{tons:.1f} tons[/magenta]"
+        for rack_id, btu, tons in results
+    )
+    lines.append(
         f"\n[bold]Total:[/bold] {int(total_btu):,} BTU/hr → [bold magenta]{total_tons:.1f} tons[/bold magenta]\n"
     )
 
-    if headroom == 1.0:
-        headroom_note = ""
-    else:
-        pct = (headroom - 1) * 100
-        headroom_note = f", {pct:+.0f}% headroom"
-    footnote = (
-        f"Note: by-circuit = 240V/30A @ 80% load, 92% UPS eff.{headroom_note}.\n"
-        f"      by-load = modeled rack watts from doctrine/power/rack-power-budget.yaml"
-        + (f" ({pct:+.0f}% headroom)" if headroom != 1.0 else "")
-        + "."
-    )
-    console.print(f"[dim]{footnote}[/dim]")
+    lines.append(f"[dim]{_format_cooling_footnote(headroom)}[/dim]")
+    console.print("\n".join(lines))
 
 
 def estimate_cooling_measured() -> None:
@@ -1,13 +1,17 @@
+from collections.abc import Sequence
+
 from inferno_core.data.nodes import load_nodes
+from inferno_core.models import Node
 from rich.console import Console
 from rich.table import Table
 
 console = Console()
 
 
-def render_rack_layout(rack_id: str, rack_u: int = 42):
-    """Render a vertical rack view with chassis assignments."""
-    nodes = load_nodes()
+def _rack_cells(rack_id: str, rack_u: int, nodes: Sequence[Node] | None) -> list[str]:
+    """Return one glyph per U, top-down (U{rack_u} first, U1 last)."""
+    if nodes is None:
+        nodes = load_nodes()
     rack_nodes = [n for n in nodes if n.rack_id == rack_id and n.chassis]
 
     # Sort by U position if present
@@ -18,16 +22,45 @@ def render_rack_layout(rack_id: str, rack_u: int = 42):
     for node in rack_nodes:
         u_start = node.chassis.u_position
         u_height = node.chassis.height_u
-        for i in range(u_height):
-            idx = rack_u - u_start - i
-            if 0 <= idx < rack_u:
-                layout[idx] = "[█]" if i == 0 else "[■]"
+        if u_height <= 0:
+            continue
+        # The chassis occupies indices head-(height-1)..head, with its first U (the head) lowest in the rack;
+        # fill the body as one clamped slice rather than cell by cell
+        head = rack_u - u_start
+        start, stop = max(head - u_height + 1, 0), min(head, rack_u)
+        if start < stop:
+            layout[start:stop] = ["[■]"] * (stop - start)
+        if 0 <= head < rack_u:
+            layout[head] = "[█]"
+
+    return layout
+
+
+def render_rack_layout_text(rack_id: str, rack_u: int = 42, nodes: Sequence[Node] | None = None) -> str:
+    """Return the rack view as plain text, one ``"<U> <glyph>"`` line per U under a title line."""
+    layout = _rack_cells(rack_id, rack_u, nodes)
+    rows = [f"Rack Layout: {rack_id} ({rack_u}U)"]
+    rows.extend(f"{rack_u - i:02} {cell}" for i, cell in enumerate(layout))
+    return "\n".join(rows)
+
+
+def render_rack_layout(rack_id: str, rack_u: int = 42, nodes: Sequence[Node] | None = None):
+    """Render a vertical rack view with chassis assignments.
+
+    Pass ``nodes`` when rendering several racks so the node manifest is loaded and validated once.
+    Output that is not going to a terminal (CI logs, redirects) is written as plain text.
+    """
+    if not console.is_terminal:
+        console.print(render_rack_layout_text(rack_id, rack_u, nodes), markup=False, highlight=False)
+        return
+
+    layout = _rack_cells(rack_id, rack_u, nodes)
 
     table = Table(title=f"Rack Layout: {rack_id} ({rack_u}U)", box=None, show_header=False)
     table.add_column("U")
     table.add_column("Occupied")
 
-    for i in range(rack_u):
-        table.add_row(f"{rack_u - i:02}", layout[i])
+    for i, cell in enumerate(layout):
+        table.add_row(f"{rack_u - i:02}", cell)
 
-    console.print(table)
+    console.print(table, highlight=False)
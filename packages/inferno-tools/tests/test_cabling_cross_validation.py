@@ -1,15 +1,16 @@
 """Tests for cabling cross-validation functionality."""
 
-import tempfile
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 import yaml
+from inferno_core.data.loader import SafeDumper
 from inferno_core.models.cross import CrossReport
 from inferno_tools.cabling.cross_validate import (
     _aggregate_intent_to_class_structure,
     _derive_intent_links,
+    _load_bom_yaml,
     _normalize_bom_to_class_structure,
     _reconcile_bom_vs_intent,
     cross_validate_bom,
@@ -181,6 +182,23 @@ class TestCrossValidation:
         assert "mgmt" in result
         assert result["mgmt"]["rj45_cat6a"][7] == 15
 
+    def test_load_bom_yaml_reuses_parse_until_file_changes(self, tmp_path):
+        """Test that an unchanged BOM file is parsed once and an edited one is re-read."""
+        bom_path = tmp_path / "bom.yaml"
+        bom_path.write_text(yaml.dump({"sfp28_25g_dac": {3: 8}}, Dumper=SafeDumper))
+
+        with patch("inferno_core.data.loader.yaml.load", wraps=yaml.load) as spy:
+            first = _load_bom_yaml(bom_path)
+            second = _load_bom_yaml(bom_path)
+            assert spy.call_count == 1
+
+            bom_path.write_text(yaml.dump({"sfp28_25g_dac": {3: 10}}, Dumper=SafeDumper))
+            third = _load_bom_yaml(bom_path)
+            assert spy.call_count == 2
+
+        assert first == second == {"meta": {}, "bom": {"sfp28_25g_dac": {3: 8}}}
+        assert third["bom"]["sfp28_25g_dac"][3] == 10
+
     def test_derive_intent_links(self, sample_topology, sample_nodes, sample_tors, sample_site, sample_policy):
         """Test deriving intent links from topology/policy."""
         links = _derive_intent_links(sample_topology, sample_tors, sample_nodes, sample_site, sample_policy)
@@ -196,6 +214,34 @@ class TestCrossValidation:
         assert len(mgmt_links) == 4  # 4 nodes × 1 mgmt each
         assert len(wan_links) == 2  # 2 WAN uplinks
 
+    def test_derive_intent_links_are_distinct_dicts(
+        self, sample_topology, sample_nodes, sample_tors, sample_site, sample_policy
+    ):
+        """Test that parallel links are separate dicts, so annotating one leaves the others alone."""
+        links = _derive_intent_links(sample_topology, sample_tors, sample_nodes, sample_site, sample_policy)
+
+        assert len({id(link) for link in links}) == len(links)
+
+        links[0]["note"] = "patched"
+        assert sum("note" in link for link in links) == 1
+
+    def test_derive_intent_uplink_bins_from_spine_distance(self, sample_tors, sample_nodes, sample_policy):
+        """Test that uplink bins follow grid distance to the spine, with a fallback for unplaced racks."""
+        topology = {"racks": [{"rack_id": "rack-1"}, {"rack_id": "rack-2"}, {"rack_id": "rack-3"}], "wan": {}}
+        site = {
+            "racks": [
+                {"id": "rack-1", "grid": [0, 0]},
+                {"id": "rack-2", "grid": [3, 0]},
+                {"id": "spine", "grid": [0, 1]},
+            ]
+        }
+
+        links = _derive_intent_links(topology, sample_tors, sample_nodes, site, sample_policy)
+        uplink_bins = {l["rack_id"]: l["length_bin_m"] for l in links if l["class"] == "leaf-spine"}
+
+        # 1 tile * 1.2 slack -> 2m, 4 tiles * 1.2 -> 5m, unplaced rack-3 uses 5m * 1.2 -> 7m
+        assert uplink_bins == {"rack-1": 2, "rack-2": 5, "rack-3": 7}
+
     def test_aggregate_intent_to_class_structure(
         self, sample_topology, sample_nodes, sample_tors, sample_site, sample_policy
     ):
@@ -270,156 +316,85 @@ class TestCrossValidation:
         assert findings[0].context["bom_bin_m"] == 1
         assert findings[0].context["intent_bin_m"] == 3
 
+    def test_reconcile_intent_bin_matched_only_once(self, sample_policy):
+        """Test that an intent bin consumed by one bin mismatch is not offered to the next BOM bin."""
+        bom_structure = {"leaf-spine": {"qsfp28_100g": {5: 2, 7: 2, 3: 1}}}
+        intent_structure = {"leaf-spine": {"qsfp28_100g": {3: 3}}}
+
+        findings = _reconcile_bom_vs_intent(bom_structure, intent_structure, sample_policy)
+
+        assert [(f.code, f.context.get("bom_bin_m", f.context.get("length_bin_m"))) for f in findings] == [
+            ("BIN_MISMATCH_WARN", 5),
+            ("PHANTOM_ITEM", 7),
+        ]
+
+    def test_reconcile_skips_classes_that_already_match(self, sample_policy):
+        """Test that only classes whose counts differ produce findings."""
+        matching = {"mgmt": {"rj45_cat6a": {5: 4}}, "leaf-node": {"sfp28_25g": {3: 8}}}
+
+        assert _reconcile_bom_vs_intent(matching, dict(matching), sample_policy) == []
+
+        bom_structure = {**matching, "leaf-spine": {"qsfp28_100g": {5: 2}}}
+        intent_structure = {**matching, "leaf-spine": {"qsfp28_100g": {5: 4}}}
+
+        findings = _reconcile_bom_vs_intent(bom_structure, intent_structure, sample_policy)
+
+        assert [(f.code, f.context["class"]) for f in findings] == [("MISSING_LINK", "leaf-spine")]
+
+
+@pytest.fixture
+def patched_loaders(monkeypatch, sample_topology, sample_tors, sample_nodes, sample_site, sample_policy):
+    """Point the cross-validation manifest and policy loaders at the sample data."""
+    import inferno_tools.cabling.cross_validate as cv
+
+    for name, data in (
+        ("load_topology", sample_topology),
+        ("load_tors", sample_tors),
+        ("load_nodes", sample_nodes),
+        ("load_site", sample_site),
+    ):
+        record = SimpleNamespace(model_dump=lambda data=data: data)
+        monkeypatch.setattr(cv, name, lambda record=record: record)
+    monkeypatch.setattr(cv, "load_cabling_policy", lambda *args, **kwargs: sample_policy)
+
+
+@pytest.fixture
+def write_bom(tmp_path):
+    """Write a BOM dict to a YAML file under the test's tmp_path and return its path."""
+
+    def _write(bom):
+        bom_path = tmp_path / "bom.yaml"
+        bom_path.write_text(yaml.dump(bom, Dumper=SafeDumper))
+        return bom_path
+
+    return _write
+
 
 class TestCrossValidationIntegration:
     """Integration tests for cross-validation."""
 
-    @patch("inferno_tools.cabling.cross_validate.load_topology")
-    @patch("inferno_tools.cabling.cross_validate.load_tors")
-    @patch("inferno_tools.cabling.cross_validate.load_nodes")
-    @patch("inferno_tools.cabling.cross_validate.load_site")
-    @patch("inferno_tools.cabling.cross_validate.load_cabling_policy")
-    def test_cross_validate_bom_happy_path(
-        self,
-        mock_policy,
-        mock_site,
-        mock_nodes,
-        mock_tors,
-        mock_topology,
-        sample_topology,
-        sample_tors,
-        sample_nodes,
-        sample_site,
-        sample_policy,
-        happy_bom,
-    ):
-        """Test full cross-validation with happy path."""
-        # Setup mocks
-        mock_topology.return_value = MagicMock()
-        mock_topology.return_value.model_dump.return_value = sample_topology
-        mock_tors.return_value = MagicMock()
-        mock_tors.return_value.model_dump.return_value = sample_tors
-        mock_nodes.return_value = MagicMock()
-        mock_nodes.return_value.model_dump.return_value = sample_nodes
-        mock_site.return_value = MagicMock()
-        mock_site.return_value.model_dump.return_value = sample_site
-        mock_policy.return_value = sample_policy
-
-        # Create temporary BOM file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(happy_bom, f)
-            bom_path = f.name
-
-        try:
-            # Run cross-validation
-            report = cross_validate_bom(bom_path=bom_path)
-
-            # Check results
-            assert isinstance(report, CrossReport)
+    @pytest.mark.parametrize(
+        "bom_fixture, summary_key, code, severity",
+        [
+            ("happy_bom", None, None, None),
+            ("missing_leaf_node_bom", "missing", "MISSING_LINK", "FAIL"),
+            ("phantom_leaf_spine_bom", "phantom", "PHANTOM_ITEM", "WARN"),
+        ],
+        ids=["happy_path", "missing_links", "phantom_items"],
+    )
+    def test_cross_validate_bom(self, request, patched_loaders, write_bom, bom_fixture, summary_key, code, severity):
+        """Test full cross-validation of a BOM file against the sample intent."""
+        report = cross_validate_bom(bom_path=write_bom(request.getfixturevalue(bom_fixture)))
+
+        assert isinstance(report, CrossReport)
+        if code is None:
             assert report.summary["missing"] == 0
             assert report.summary["phantom"] == 0
             assert len(report.findings) == 0
-
-        finally:
-            Path(bom_path).unlink()
-
-    @patch("inferno_tools.cabling.cross_validate.load_topology")
-    @patch("inferno_tools.cabling.cross_validate.load_tors")
-    @patch("inferno_tools.cabling.cross_validate.load_nodes")
-    @patch("inferno_tools.cabling.cross_validate.load_site")
-    @patch("inferno_tools.cabling.cross_validate.load_cabling_policy")
-    def test_cross_validate_bom_missing_links(
-        self,
-        mock_policy,
-        mock_site,
-        mock_nodes,
-        mock_tors,
-        mock_topology,
-        sample_topology,
-        sample_tors,
-        sample_nodes,
-        sample_site,
-        sample_policy,
-        missing_leaf_node_bom,
-    ):
-        """Test cross-validation with missing links."""
-        # Setup mocks
-        mock_topology.return_value = MagicMock()
-        mock_topology.return_value.model_dump.return_value = sample_topology
-        mock_tors.return_value = MagicMock()
-        mock_tors.return_value.model_dump.return_value = sample_tors
-        mock_nodes.return_value = MagicMock()
-        mock_nodes.return_value.model_dump.return_value = sample_nodes
-        mock_site.return_value = MagicMock()
-        mock_site.return_value.model_dump.return_value = sample_site
-        mock_policy.return_value = sample_policy
-
-        # Create temporary BOM file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(missing_leaf_node_bom, f)
-            bom_path = f.name
-
-        try:
-            # Run cross-validation
-            report = cross_validate_bom(bom_path=bom_path)
-
-            # Check results
-            assert isinstance(report, CrossReport)
-            assert report.summary["missing"] > 0
-            assert any(f.code == "MISSING_LINK" for f in report.findings)
-            assert any(f.severity == "FAIL" for f in report.findings)
-
-        finally:
-            Path(bom_path).unlink()
-
-    @patch("inferno_tools.cabling.cross_validate.load_topology")
-    @patch("inferno_tools.cabling.cross_validate.load_tors")
-    @patch("inferno_tools.cabling.cross_validate.load_nodes")
-    @patch("inferno_tools.cabling.cross_validate.load_site")
-    @patch("inferno_tools.cabling.cross_validate.load_cabling_policy")
-    def test_cross_validate_bom_phantom_items(
-        self,
-        mock_policy,
-        mock_site,
-        mock_nodes,
-        mock_tors,
-        mock_topology,
-        sample_topology,
-        sample_tors,
-        sample_nodes,
-        sample_site,
-        sample_policy,
-        phantom_leaf_spine_bom,
-    ):
-        """Test cross-validation with phantom items."""
-        # Setup mocks
-        mock_topology.return_value = MagicMock()
-        mock_topology.return_value.model_dump.return_value = sample_topology
-        mock_tors.return_value = MagicMock()
-        mock_tors.return_value.model_dump.return_value = sample_tors
-        mock_nodes.return_value = MagicMock()
-        mock_nodes.return_value.model_dump.return_value = sample_nodes
-        mock_site.return_value = MagicMock()
-        mock_site.return_value.model_dump.return_value = sample_site
-        mock_policy.return_value = sample_policy
-
-        # Create temporary BOM file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(phantom_leaf_spine_bom, f)
-            bom_path = f.name
-
-        try:
-            # Run cross-validation
-            report = cross_validate_bom(bom_path=bom_path)
-
-            # Check results
-            assert isinstance(report, CrossReport)
-            assert report.summary["phantom"] > 0
-            assert any(f.code == "PHANTOM_ITEM" for f in report.findings)
-            assert any(f.severity == "WARN" for f in report.findings)
-
-        finally:
-            Path(bom_path).unlink()
+        else:
+            assert report.summary[summary_key] > 0
+            assert any(f.code == code for f in report.findings)
+            assert any(f.severity == severity for f in report.findings)
 
     def test_cross_validate_bom_load_error(self):
         """Test cross-validation with load error."""
@@ -6,13 +6,52 @@ work correctly and produce expected results for all fixture scenarios.
 """
 
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+from inferno_core.data.cabling_policy import load_cabling_policy_typed
+from inferno_core.models.cabling_policy import CablingPolicy
+from inferno_core.models.network import NetworkTopology
+from inferno_core.models.records import SiteRec
 from inferno_tools.cabling.common import (
+    NetworkLink,
     apply_slack,
+    build_network_links,
+    compile_media_rules,
+    compile_policy,
     compute_rack_distance_m,
+    compute_rack_distances_m,
+    precompute_bins,
+    select_cable_type_and_bin,
     select_length_bin,
+    select_length_bin_sorted,
+    select_length_bins_many,
 )
+from pydantic import ValidationError
+
+_GEOMETRY_POLICIES = (
+    "boundary_equal",
+    "just_over_threshold",
+    "far_racks",
+    "slack_variants/slack_1_0",
+    "slack_variants/slack_1_5",
+    "tile_variants",
+    "rj45_long",
+)
+
+
+@pytest.fixture(scope="session")
+def fixtures_path():
+    """Path to geometry test fixtures."""
+    return Path(__file__).parent / "fixtures" / "cabling" / "geometry"
+
+
+@pytest.fixture(scope="session")
+def geometry_policies(fixtures_path):
+    """Typed cabling policy of each geometry fixture, keyed by fixture name; loaded once per session."""
+    return {
+        name: load_cabling_policy_typed(fixtures_path / name / "cabling-policy.yaml") for name in _GEOMETRY_POLICIES
+    }
 
 
 class TestGeometryHelpers:
@@ -41,6 +80,15 @@ class TestGeometryHelpers:
         assert apply_slack(10.0, 1.2) == 12.0
         assert apply_slack(5.0, 1.5) == 7.5
 
+    def test_compute_rack_distances_m(self):
+        """Test batched distances match the pairwise helper."""
+        grids = {"rack-1": (0, 0), "rack-2": (3, 4), "rack-3": (-2, 1)}
+
+        distances = compute_rack_distances_m((1, 1), grids, 0.6)
+
+        assert distances == {rack_id: compute_rack_distance_m((1, 1), grid, 0.6) for rack_id, grid in grids.items()}
+        assert compute_rack_distances_m((0, 0), {}, 1.0) == {}
+
     def test_select_length_bin(self):
         """Test length bin selection."""
         bins = [1, 3, 5, 10, 30]
@@ -60,28 +108,136 @@ class TestGeometryHelpers:
         # Very small distance
         assert select_length_bin(0.5, bins) == 1
 
+    def test_select_length_bin_unsorted_bins(self):
+        """Test that bin order and duplicates do not affect selection."""
+        assert precompute_bins([10, 3, 1, 3, 5]) == (1, 3, 5, 10)
+        assert select_length_bin(2.0, [10, 3, 1, 3, 5]) == 3
+        assert select_length_bin(4.0, (5, 1, 3)) == 5
+        assert select_length_bin(11.0, [10, 3]) is None
+
+    def test_select_length_bin_sorted(self):
+        """Test the variant for bins that are already sorted."""
+        bins = (1, 3, 5, 10)
+
+        assert select_length_bin_sorted(3.0, bins) == 3
+        assert select_length_bin_sorted(3.1, bins) == 5
+        assert select_length_bin_sorted(10.5, bins) is None
+
+    def test_select_length_bins_many(self):
+        """Test that batch selection matches the scalar lookup for every distance."""
+        bins = [10, 3, 1, 5]
+        distances = [0.5, 3.0, 3.1, 10.0, 12.0]
+
+        assert select_length_bins_many(distances, bins) == [select_length_bin(d, bins) for d in distances]
+        assert select_length_bins_many([], bins) == []
+        assert select_length_bin_sorted(1.0, ()) is None
+
+    def test_compile_media_rules(self):
+        """Test flattening of policy media rules into per-link-type label tuples."""
+        policy = CablingPolicy.model_validate(
+            {
+                "media_rules": {
+                    "sfp28_25g": {"dac_max_m": 3, "labels": {"dac": "25 DAC", "aoc": "25 AOC", "fiber": "25 SR"}},
+                    "rj45_cat6a": {"labels": {"label": "RJ45 Cat6A"}},
+                }
+            }
+        )
+        table = compile_media_rules(policy)
+
+        assert table["25G"] == (3, "25 DAC", "25 AOC", "25 SR")
+        assert table["RJ45"][1:] == ("RJ45 Cat6A",) * 3
+        assert table["100G"][1] == "Unknown 100G"
+
+    def test_compile_policy(self):
+        """Test that heuristics and bins are resolved once into the compiled policy."""
+        policy = CablingPolicy.model_validate({"heuristics": {"slack_factor": 1.5, "tile_m": 0.6}})
+        compiled = compile_policy(policy, [10, 1, 3])
+
+        assert compiled.slack_factor == 1.5
+        assert compiled.tile_m == 0.6
+        assert compiled.bins_sorted == (1, 3, 10)
+        assert compiled.spares_fraction == policy.defaults.spares_fraction
+
+    def test_select_cable_type_and_bin(self):
+        """Test media and bin selection against a typed policy."""
+        policy = CablingPolicy.model_validate(
+            {
+                "media_rules": {
+                    "sfp28_25g": {"dac_max_m": 3, "labels": {"dac": "25 DAC", "aoc": "25 AOC", "fiber": "25 SR"}},
+                },
+                "heuristics": {"slack_factor": 1.2},
+            }
+        )
+        bins = [1, 2, 3, 5, 7, 10]
+
+        assert select_cable_type_and_bin(2.0, "25G", policy, bins) == ("25 DAC", 3)
+        assert select_cable_type_and_bin(5.0, "25G", policy, bins) == ("25 AOC", 7)
+        assert select_cable_type_and_bin(15.0, "25G", policy, bins) == ("25 SR", 10)
+        assert select_cable_type_and_bin(2.0, "400G", policy, bins) == ("Unknown 400G", 3)
+
+    def test_select_cable_type_and_bin_reuses_compiled_policy(self):
+        """Test that repeated selections against one policy compile it only once."""
+        policy = CablingPolicy.model_validate({"heuristics": {"slack_factor": 1.0}})
+        bins = [1, 3, 5]
+
+        with patch("inferno_tools.cabling.common.compile_policy", wraps=compile_policy) as spy:
+            assert select_cable_type_and_bin(2.0, "25G", policy, bins) == ("Unknown 25G", 3)
+            assert select_cable_type_and_bin(4.0, "25G", policy, bins) == ("Unknown 25G", 5)
+
+        assert spy.call_count == 1
+
+
+class TestNetworkLink:
+    """Test the NetworkLink record returned by build_network_links."""
+
+    def test_legacy_dict_access(self):
+        """Test that the record still reads like the old link dicts."""
+        link = NetworkLink("spine-1:eth1/1", "tor-1:qsfp28-1", "100G", 2.0, "QSFP28 100G DAC", 3, "spine_to_leaf")
+
+        assert link["from"] == "spine-1:eth1/1"
+        assert link["to"] == "tor-1:qsfp28-1"
+        assert link["length_bin"] == 3
+        assert link.to_dict() == {
+            "from": "spine-1:eth1/1",
+            "to": "tor-1:qsfp28-1",
+            "type": "100G",
+            "distance_m": 2.0,
+            "cable_type": "QSFP28 100G DAC",
+            "length_bin": 3,
+            "category": "spine_to_leaf",
+        }
+
+    def test_build_links_with_site_wan_handoff(self):
+        """Test that a site-level WAN handoff adds one RJ45 link per uplink."""
+        topology = NetworkTopology.model_construct(spines=[], leafs=[])
+        site = SiteRec.model_validate({"racks": [], "wan_handoff": {"count": 3}})
+        policy = CablingPolicy.model_validate({"media_rules": {"rj45_cat6a": {"labels": {"label": "RJ45 Cat6A"}}}})
+
+        links = build_network_links(topology, site, policy)
+
+        assert [link.dst for link in links] == ["wan-router:1", "wan-router:2", "wan-router:3"]
+        assert all(link.category == "wan" and link.cable_type == "RJ45 Cat6A" for link in links)
+        assert build_network_links(topology, SiteRec(racks=[]), policy) == []
+
+    @pytest.mark.parametrize("count", [None, 2.7, -1])
+    def test_site_wan_handoff_rejects_invalid_count(self, count):
+        """Test that a null, fractional or negative WAN handoff count fails site validation."""
+        with pytest.raises(ValidationError):
+            SiteRec.model_validate({"racks": [], "wan_handoff": {"count": count}})
+
 
 class TestGeometryFixtures:
     """Test geometry calculations using the test fixtures."""
 
-    @pytest.fixture
-    def fixtures_path(self):
-        """Path to geometry test fixtures."""
-        return Path(__file__).parent / "fixtures" / "cabling" / "geometry"
-
-    def test_boundary_equal_calculation(self, fixtures_path):
+    def test_boundary_equal_calculation(self, geometry_policies):
         """Test boundary_equal fixture - distance exactly at dac_max_m."""
         # Load policy to get parameters
-        import yaml
-
-        policy_path = fixtures_path / "boundary_equal" / "cabling-policy.yaml"
-        with open(policy_path) as f:
-            policy = yaml.safe_load(f)
+        policy = geometry_policies["boundary_equal"]
 
         # Extract parameters
-        tile_m = policy["heuristics"]["tile_m"]  # 1.25
-        slack_factor = policy["heuristics"]["slack_factor"]  # 1.2
-        dac_max_m = policy["media_rules"]["qsfp28_100g"]["dac_max_m"]  # 3.0
+        tile_m = policy.heuristics.tile_m  # 1.25
+        slack_factor = policy.heuristics.slack_factor  # 1.2
+        dac_max_m = policy.media_rules["qsfp28_100g"].dac_max_m  # 3.0
 
         # Calculate distance: 2 tiles * 1.25 * 1.2 = 3.0m exactly
         base_distance = compute_rack_distance_m((0, 0), (2, 0), tile_m)
@@ -94,22 +250,18 @@ class TestGeometryFixtures:
         assert cable_length <= dac_max_m
 
         # Should select appropriate bin
-        bins = policy["media_rules"]["qsfp28_100g"]["bins_m"]
+        bins = policy.media_rules["qsfp28_100g"].bins_m
         selected_bin = select_length_bin(cable_length, bins)
         assert selected_bin == 3  # Should select 3m bin
 
-    def test_just_over_threshold_calculation(self, fixtures_path):
+    def test_just_over_threshold_calculation(self, geometry_policies):
         """Test just_over_threshold fixture - distance slightly over dac_max_m."""
-        import yaml
-
-        policy_path = fixtures_path / "just_over_threshold" / "cabling-policy.yaml"
-        with open(policy_path) as f:
-            policy = yaml.safe_load(f)
+        policy = geometry_policies["just_over_threshold"]
 
         # Extract parameters
-        tile_m = policy["heuristics"]["tile_m"]  # 1.3
-        slack_factor = policy["heuristics"]["slack_factor"]  # 1.2
-        dac_max_m = policy["media_rules"]["qsfp28_100g"]["dac_max_m"]  # 3.0
+        tile_m = policy.heuristics.tile_m  # 1.3
+        slack_factor = policy.heuristics.slack_factor  # 1.2
+        dac_max_m = policy.media_rules["qsfp28_100g"].dac_max_m  # 3.0
 
         # Calculate distance: 2 tiles * 1.3 * 1.2 = 3.12m (just over 3.0m)
         base_distance = compute_rack_distance_m((0, 0), (2, 0), tile_m)
@@ -122,21 +274,17 @@ class TestGeometryFixtures:
         assert cable_length > dac_max_m
 
         # Should still find a suitable bin
-        bins = policy["media_rules"]["qsfp28_100g"]["bins_m"]
+        bins = policy.media_rules["qsfp28_100g"].bins_m
         selected_bin = select_length_bin(cable_length, bins)
         assert selected_bin == 5  # Should select 5m bin
 
-    def test_far_racks_calculation(self, fixtures_path):
+    def test_far_racks_calculation(self, geometry_policies):
         """Test far_racks fixture - distance exceeding max bin."""
-        import yaml
-
-        policy_path = fixtures_path / "far_racks" / "cabling-policy.yaml"
-        with open(policy_path) as f:
-            policy = yaml.safe_load(f)
+        policy = geometry_policies["far_racks"]
 
         # Extract parameters
-        tile_m = policy["heuristics"]["tile_m"]  # 1.0
-        slack_factor = policy["heuristics"]["slack_factor"]  # 1.2
+        tile_m = policy.heuristics.tile_m  # 1.0
+        slack_factor = policy.heuristics.slack_factor  # 1.2
 
         # Calculate distance: 9 tiles * 1.0 * 1.2 = 10.8m
         base_distance = compute_rack_distance_m((0, 0), (9, 0), tile_m)
@@ -146,7 +294,7 @@ class TestGeometryFixtures:
         assert abs(cable_length - 10.8) < 0.001  # Exceeds max bin of 10m (floating point tolerance)
 
         # Should exceed maximum bin
-        bins = policy["media_rules"]["qsfp28_100g"]["bins_m"]
+        bins = policy.media_rules["qsfp28_100g"].bins_m
         max_bin = max(bins)
         assert max_bin == 10
         assert cable_length > max_bin
@@ -155,19 +303,11 @@ class TestGeometryFixtures:
         selected_bin = select_length_bin(cable_length, bins)
         assert selected_bin is None
 
-    def test_slack_variants_calculation(self, fixtures_path):
+    def test_slack_variants_calculation(self, geometry_policies):
         """Test slack_variants fixtures - different slack_factor values."""
-        import yaml
-
-        # Test slack_factor = 1.0
-        policy_path_1_0 = fixtures_path / "slack_variants" / "slack_1_0" / "cabling-policy.yaml"
-        with open(policy_path_1_0) as f:
-            yaml.safe_load(f)
-
-        # Test slack_factor = 1.5
-        policy_path_1_5 = fixtures_path / "slack_variants" / "slack_1_5" / "cabling-policy.yaml"
-        with open(policy_path_1_5) as f:
-            yaml.safe_load(f)
+        # Test slack_factor = 1.0 and 1.5
+        assert geometry_policies["slack_variants/slack_1_0"].heuristics.slack_factor == 1.0
+        assert geometry_policies["slack_variants/slack_1_5"].heuristics.slack_factor == 1.5
 
         # Same base distance, different slack factors
         base_distance = 2.0  # Same rack connection
@@ -186,17 +326,13 @@ class TestGeometryFixtures:
         assert bin_1_0 == 3  # 2.0m -> 3m bin
         assert bin_1_5 == 3  # 3.0m -> 3m bin (exact match)
 
-    def test_tile_variants_calculation(self, fixtures_path):
+    def test_tile_variants_calculation(self, geometry_policies):
         """Test tile_variants fixture - different tile_m values."""
-        import yaml
-
-        policy_path = fixtures_path / "tile_variants" / "cabling-policy.yaml"
-        with open(policy_path) as f:
-            policy = yaml.safe_load(f)
+        policy = geometry_policies["tile_variants"]
 
         # Extract parameters
-        tile_m = policy["heuristics"]["tile_m"]  # 2.0
-        slack_factor = policy["heuristics"]["slack_factor"]  # 1.2
+        tile_m = policy.heuristics.tile_m  # 2.0
+        slack_factor = policy.heuristics.slack_factor  # 1.2
 
         # Calculate distance: 2 tiles * 2.0 * 1.2 = 4.8m
         base_distance = compute_rack_distance_m((0, 0), (2, 0), tile_m)
@@ -206,28 +342,24 @@ class TestGeometryFixtures:
         assert cable_length == 4.8
 
         # Should select 5m bin
-        bins = policy["media_rules"]["qsfp28_100g"]["bins_m"]
+        bins = policy.media_rules["qsfp28_100g"].bins_m
         selected_bin = select_length_bin(cable_length, bins)
         assert selected_bin == 5
 
-    def test_rj45_long_calculation(self, fixtures_path):
+    def test_rj45_long_calculation(self, geometry_policies):
         """Test rj45_long fixture - RJ45 bins > 100m."""
-        import yaml
-
-        policy_path = fixtures_path / "rj45_long" / "cabling-policy.yaml"
-        with open(policy_path) as f:
-            policy = yaml.safe_load(f)
+        policy = geometry_policies["rj45_long"]
 
         # Extract parameters for RJ45 management connections
-        mgmt_distance = policy["heuristics"]["same_rack_leaf_to_node_m"]  # 90.0
-        slack_factor = policy["heuristics"]["slack_factor"]  # 1.2
+        mgmt_distance = policy.heuristics.same_rack_leaf_to_node_m  # 90.0
+        slack_factor = policy.heuristics.slack_factor  # 1.2
 
         # Calculate RJ45 connection length: 90.0 * 1.2 = 108.0m
         cable_length = apply_slack(mgmt_distance, slack_factor)
         assert cable_length == 108.0
 
         # Should select 150m bin (> 100m)
-        rj45_bins = policy["media_rules"]["rj45_cat6a"]["bins_m"]
+        rj45_bins = policy.media_rules["rj45_cat6a"].bins_m
         selected_bin = select_length_bin(cable_length, rj45_bins)
         assert selected_bin == 150
         assert selected_bin > 100  # Should trigger RJ45_BIN_GT_100M warning
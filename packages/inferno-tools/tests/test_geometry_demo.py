@@ -4,13 +4,12 @@ Demonstration script for TASK.cabling.geometry-stress functionality.
 This script validates that all geometry features are working correctly.
 """
 
-import sys
+import logging
+from collections import defaultdict
+from operator import attrgetter
 from pathlib import Path
 
-# Add packages to path
-sys.path.insert(0, str(Path("packages/inferno-tools/src")))
-sys.path.insert(0, str(Path("packages/inferno-core/src")))
-
+import pytest
 from inferno_core.data.network_loader import (
     load_nodes,
     load_site,
@@ -24,96 +23,121 @@ from inferno_tools.cabling.common import (
     select_length_bin,
 )
 
+logger = logging.getLogger(__name__)
+
+_GEOMETRY_FIXTURES = Path(__file__).parent / "fixtures" / "cabling" / "geometry"
+_tor_id = attrgetter("id")
+
+
+def _load_bundle(fixture_name, with_site=True):
+    """Load ``(policy, topology, tors, nodes, site)`` for one geometry fixture directory."""
+    fixture_path = _GEOMETRY_FIXTURES / fixture_name
+
+    policy = _load_policy(str(fixture_path / "cabling-policy.yaml"))
+    topology = load_topology(str(fixture_path / "topology.yaml"))
+    tors_list, spine_rec = load_tors(str(fixture_path / "tors.yaml"))
+    tors = dict(zip(map(_tor_id, tors_list), tors_list))
+    nodes = load_nodes(str(fixture_path / "nodes.yaml"))
+    site = load_site(str(fixture_path / "site.yaml")) if with_site else None
+    return policy, topology, tors, nodes, site
+
+
+@pytest.fixture(scope="session")
+def far_racks_bundle():
+    """Fixture data for far_racks, loaded once per session; validate_lengths does not mutate it."""
+    return _load_bundle("far_racks")
+
+
+@pytest.fixture(scope="session")
+def no_site_bundle():
+    """Fixture data for no_site, which has no site.yaml, loaded once per session."""
+    return _load_bundle("no_site", with_site=False)
+
+
+def _findings_by_code(bundle):
+    """Run validate_lengths over a bundle and group its findings by code."""
+    policy, topology, tors, nodes, site = bundle
+    by_code = defaultdict(list)
+    for finding in validate_lengths(topology, tors, nodes, site, policy):
+        by_code[finding.code].append(finding)
+    return by_code
+
+
+@pytest.fixture(scope="session")
+def far_racks_findings(far_racks_bundle):
+    """far_racks findings grouped by code, validated once per session."""
+    return _findings_by_code(far_racks_bundle)
+
+
+@pytest.fixture(scope="session")
+def no_site_findings(no_site_bundle):
+    """no_site findings grouped by code, validated once per session."""
+    return _findings_by_code(no_site_bundle)
+
 
 def test_shared_helpers():
     """Test the shared geometry helper functions."""
-    print("Testing shared geometry helpers...")
+    logger.debug("Testing shared geometry helpers...")
 
     # Test Manhattan distance calculation
     distance = compute_rack_distance_m((0, 0), (3, 2), 1.0)
     assert distance == 5.0, f"Expected 5.0, got {distance}"
-    print("✓ Manhattan distance calculation works")
+    logger.debug("✓ Manhattan distance calculation works")
 
     # Test slack application
     slacked = apply_slack(10.0, 1.2)
     assert slacked == 12.0, f"Expected 12.0, got {slacked}"
-    print("✓ Slack factor application works")
+    logger.debug("✓ Slack factor application works")
 
     # Test length bin selection
     bins = [1, 3, 5, 10]
     selected = select_length_bin(3.1, bins)
     assert selected == 5, f"Expected 5, got {selected}"
-    print("✓ Length bin selection works")
+    logger.debug("✓ Length bin selection works")
 
     # Test boundary condition
     selected = select_length_bin(3.0, bins)
     assert selected == 3, f"Expected 3, got {selected}"
-    print("✓ Boundary condition (exact match) works")
+    logger.debug("✓ Boundary condition (exact match) works")
 
     # Test exceeds all bins
     selected = select_length_bin(15.0, bins)
     assert selected is None, f"Expected None, got {selected}"
-    print("✓ Exceeds all bins handling works")
+    logger.debug("✓ Exceeds all bins handling works")
 
 
-def test_geometry_fixture():
-    """Test geometry validation with a specific fixture."""
-    print("\nTesting geometry validation with far_racks fixture...")
+@pytest.mark.parametrize(
+    "findings, code, severity",
+    [
+        ("far_racks_findings", "LENGTH_EXCEEDS_MAX_BIN", "FAIL"),
+        ("no_site_findings", "SITE_GEOMETRY_MISSING", "INFO"),
+    ],
+    ids=["far_racks", "no_site"],
+)
+def test_geometry_fixture(request, findings, code, severity):
+    """Test that each geometry fixture produces exactly its expected finding."""
+    logger.debug("Testing geometry validation with %s", findings)
 
-    fixture_path = Path("packages/inferno-tools/tests/fixtures/cabling/geometry/far_racks")
+    matching = request.getfixturevalue(findings)[code]
+    assert len(matching) == 1, f"Expected one {code} finding"
 
-    # Load fixture data
-    policy = _load_policy(str(fixture_path / "cabling-policy.yaml"))
-    topology = load_topology(str(fixture_path / "topology.yaml"))
-    tors_list, spine_rec = load_tors(str(fixture_path / "tors.yaml"))
-    tors = {tor.id: tor for tor in tors_list}
-    nodes = load_nodes(str(fixture_path / "nodes.yaml"))
-    site = load_site(str(fixture_path / "site.yaml"))
+    finding = matching[0]
+    assert finding.severity == severity, f"Expected {severity}, got {finding.severity}"
+
+    logger.debug("✓ %s include expected %s finding", findings, code)
+    logger.debug("  - Severity: %s", finding.severity)
+    logger.debug("  - Message: %s", finding.message)
 
-    # Run validation
-    findings = validate_lengths(topology, tors, nodes, site, policy)
 
-    # Check for expected LENGTH_EXCEEDS_MAX_BIN finding
-    max_bin_findings = [f for f in findings if f.code == "LENGTH_EXCEEDS_MAX_BIN"]
-    assert len(max_bin_findings) > 0, "Expected LENGTH_EXCEEDS_MAX_BIN finding"
+def test_far_racks_finding_context(far_racks_findings):
+    """Test that the far_racks max-bin finding names the rack, media and distance."""
+    assert far_racks_findings["LENGTH_EXCEEDS_MAX_BIN"], "Expected LENGTH_EXCEEDS_MAX_BIN finding"
+    finding = far_racks_findings["LENGTH_EXCEEDS_MAX_BIN"][0]
 
-    finding = max_bin_findings[0]
-    assert finding.severity == "FAIL", f"Expected FAIL, got {finding.severity}"
     assert "rack-02" in finding.context.get("rack_id", ""), "Expected rack-02 in context"
     assert finding.context.get("media_class") == "QSFP28", "Expected QSFP28 media class"
     assert finding.context.get("distance_m", 0) > 10, "Expected distance > 10m"
 
-    print("✓ far_racks fixture produces expected LENGTH_EXCEEDS_MAX_BIN finding")
-    print(f"  - Severity: {finding.severity}")
-    print(f"  - Rack: {finding.context.get('rack_id')}")
-    print(f"  - Distance: {finding.context.get('distance_m'):.1f}m")
-    print(f"  - Max bin: {finding.context.get('bin')}m")
-
-
-def test_no_site_fixture():
-    """Test validation behavior when site.yaml is missing."""
-    print("\nTesting no_site fixture...")
-
-    fixture_path = Path("packages/inferno-tools/tests/fixtures/cabling/geometry/no_site")
-
-    # Load fixture data (no site.yaml)
-    policy = _load_policy(str(fixture_path / "cabling-policy.yaml"))
-    topology = load_topology(str(fixture_path / "topology.yaml"))
-    tors_list, spine_rec = load_tors(str(fixture_path / "tors.yaml"))
-    tors = {tor.id: tor for tor in tors_list}
-    nodes = load_nodes(str(fixture_path / "nodes.yaml"))
-    site = None  # No site.yaml
-
-    # Run validation
-    findings = validate_lengths(topology, tors, nodes, site, policy)
-
-    # Check for expected SITE_GEOMETRY_MISSING finding
-    geometry_findings = [f for f in findings if f.code == "SITE_GEOMETRY_MISSING"]
-    assert len(geometry_findings) == 1, "Expected SITE_GEOMETRY_MISSING finding"
-
-    finding = geometry_findings[0]
-    assert finding.severity == "INFO", f"Expected INFO, got {finding.severity}"
-
-    print("✓ no_site fixture produces expected SITE_GEOMETRY_MISSING finding")
-    print(f"  - Severity: {finding.severity}")
-    print(f"  - Message: {finding.message}")
+    logger.debug("  - Rack: %s", finding.context.get("rack_id"))
+    logger.debug("  - Distance: %.1fm", finding.context.get("distance_m"))
+    logger.debug("  - Max bin: %sm", finding.context.get("bin"))
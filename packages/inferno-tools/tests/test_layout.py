@@ -0,0 +1,72 @@
+"""Tests for the rack layout renderer."""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from inferno_tools import layout
+from inferno_tools.layout import render_rack_layout, render_rack_layout_text
+from rich.console import Console
+
+
+def _node(rack_id, u_position, height_u):
+    """A node stand-in carrying only the fields the layout reads."""
+    return SimpleNamespace(rack_id=rack_id, chassis=SimpleNamespace(u_position=u_position, height_u=height_u))
+
+
+@pytest.fixture
+def rack_nodes():
+    """A 3U chassis at U2 and a 1U chassis at U6 in rack-1, plus a node in another rack."""
+    return [_node("rack-1", 2, 3), _node("rack-1", 6, 1), _node("rack-2", 1, 1)]
+
+
+class TestRenderRackLayoutText:
+    """Test the plain-text rack view."""
+
+    def test_rows_run_top_down_with_devices_and_filler(self, rack_nodes):
+        """Test U ordering, a multi-U device's head and body, and the empty-slot filler."""
+        text = render_rack_layout_text("rack-1", rack_u=6, nodes=rack_nodes)
+
+        assert text.splitlines() == [
+            "Rack Layout: rack-1 (6U)",
+            "06 [█]",
+            "05 [ ]",
+            "04 [■]",
+            "03 [■]",
+            "02 [█]",
+            "01 [ ]",
+        ]
+
+    def test_empty_rack_is_all_filler(self):
+        """Test that a rack with no nodes renders only empty slots."""
+        assert render_rack_layout_text("rack-9", rack_u=2, nodes=[]).splitlines()[1:] == ["02 [ ]", "01 [ ]"]
+
+    def test_device_past_the_top_is_clamped(self):
+        """Test that a chassis extending above the rack only fills the slots that exist."""
+        text = render_rack_layout_text("rack-1", rack_u=3, nodes=[_node("rack-1", 2, 4)])
+
+        assert text.splitlines()[1:] == ["03 [■]", "02 [█]", "01 [ ]"]
+
+
+class TestRenderRackLayout:
+    """Test the console renderer."""
+
+    def test_defaults_to_node_manifest_and_plain_text_off_terminal(self, monkeypatch, rack_nodes):
+        """Test that nodes=None loads the manifest and non-terminal output is the plain-text view."""
+        out = io.StringIO()
+        monkeypatch.setattr(layout, "console", Console(file=out, force_terminal=False))
+        monkeypatch.setattr(layout, "load_nodes", lambda: rack_nodes)
+
+        render_rack_layout("rack-1", rack_u=6)
+
+        assert out.getvalue() == render_rack_layout_text("rack-1", rack_u=6, nodes=rack_nodes) + "\n"
+
+    def test_terminal_output_renders_table(self, monkeypatch, rack_nodes):
+        """Test that a terminal console still gets the Rich table with the same cells."""
+        out = io.StringIO()
+        monkeypatch.setattr(layout, "console", Console(file=out, force_terminal=True, color_system=None, width=40))
+
+        render_rack_layout("rack-1", rack_u=6, nodes=rack_nodes)
+
+        rows = [line.split() for line in out.getvalue().splitlines() if line.strip()[:2].isdigit()]
+        assert rows == [["06", "[█]"], ["05", "[", "]"], ["04", "[■]"], ["03", "[■]"], ["02", "[█]"], ["01", "[", "]"]]